@@ -0,0 +1,47 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.metrics import registry
+from app.db import session
+
+# Operational endpoints, outside the versioned API
+health_router = APIRouter(prefix="/health", tags=["Monitoring"])
+router = APIRouter(tags=["Monitoring"])
+
+
+@health_router.get(
+    "/live",
+    summary="Liveness probe",
+    description="The process is up and serving requests.",
+)
+async def liveness() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@health_router.get(
+    "/ready",
+    summary="Readiness probe",
+    description="Warms the connection pools on first call, then checks the DB.",
+    responses={503: {"description": "Database unavailable"}},
+)
+async def readiness() -> JSONResponse:
+    try:
+        await session.ensure_ready()
+    except (SQLAlchemyError, OSError):
+        return JSONResponse(
+            {"status": "unavailable"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    return JSONResponse({"status": "ready"})
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus metrics",
+    description="Request, SQL, repository and connection pool metrics.",
+)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
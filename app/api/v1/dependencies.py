@@ -3,23 +3,135 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_session
+from app.config import settings
+from app.core.admission import AdmissionController
+from app.core.cache import ICacheBackend, LRUCache
+from app.core.events import ChangeFeed
+from app.core.metrics import CallbackGauge, registry
+from app.core.singleflight import SingleFlight
+from app.db.session import (
+    async_session_factory,
+    change_feeds,
+    get_read_session,
+    get_session,
+)
+from app.models.item import Item
+from app.repositories.cached import CachedRepository
+from app.repositories.coalescing import WriteCoalescer
+from app.repositories.instrumented import InstrumentedRepository
+from app.repositories.interfaces import IRepository
 from app.repositories.item import ItemRepository
 from app.services.item import ItemService
 
+# Process-wide entity cache, shared by all requests of this worker
+_item_cache = LRUCache(settings.ENTITY_CACHE_MAX_SIZE, settings.ENTITY_CACHE_TTL)
+registry.register(
+    CallbackGauge(
+        "entity_cache",
+        "Entity cache size and cumulative hits and misses.",
+        ("cache", "stat"),
+        lambda: (
+            (("items", stat), value) for stat, value in _item_cache.stats().items()
+        ),
+    )
+)
+
+
+# Process-wide admission budgets for the item routes (checked per request, so
+# ADMISSION_ENABLED=false costs one attribute read)
+item_admission = AdmissionController(
+    read_limit=settings.ADMISSION_READ_LIMIT,
+    write_limit=settings.ADMISSION_WRITE_LIMIT,
+    max_queue=settings.ADMISSION_QUEUE_SIZE,
+    timeout=settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    route_limits=settings.ADMISSION_ROUTE_LIMITS,
+    exempt_routes=frozenset(settings.ADMISSION_EXEMPT_ROUTES),
+    enabled=settings.ADMISSION_ENABLED,
+)
+registry.register(
+    CallbackGauge(
+        "admission_requests",
+        "Admission budget usage by state (in_flight, queued, limit).",
+        ("budget", "state"),
+        item_admission.usage,
+    )
+)
+
+
+# Repository for the coalescer's own sessions (creates bypass the entity cache)
+def _coalescer_repository(session: AsyncSession) -> IRepository[Item]:
+    return ItemRepository(
+        session,
+        count_strategy=settings.COUNT_STRATEGY,
+        count_cache_ttl=settings.COUNT_CACHE_TTL,
+    )
+
+
+# Process-wide group commit for single-item creates, when enabled
+_item_coalescer = (
+    WriteCoalescer(
+        async_session_factory,
+        _coalescer_repository,
+        "items",
+        max_batch=settings.WRITE_COALESCING_MAX_BATCH,
+        window=settings.WRITE_COALESCING_WINDOW_MS / 1000,
+    )
+    if settings.WRITE_COALESCING_ENABLED
+    else None
+)
+
+
+# Process-wide singleflight for item reads, when enabled
+_item_reads = SingleFlight("items") if settings.READ_COALESCING_ENABLED else None
+
 
 # DIP: Dependency providers - swap implementations without changing endpoints
+def get_item_cache() -> ICacheBackend:
+    return _item_cache
+
+
+def get_item_coalescer() -> WriteCoalescer[Item] | None:
+    return _item_coalescer
+
+
+def get_item_reads() -> SingleFlight | None:
+    return _item_reads
+
+
+def get_item_feed() -> ChangeFeed:
+    return change_feeds.get("items")
+
+
 def get_item_repository(
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> ItemRepository:
-    return ItemRepository(session)
+    read_session: Annotated[AsyncSession | None, Depends(get_read_session)],
+    cache: Annotated[ICacheBackend, Depends(get_item_cache)],
+) -> IRepository[Item]:
+    repository = ItemRepository(
+        session,
+        count_strategy=settings.COUNT_STRATEGY,
+        count_cache_ttl=settings.COUNT_CACHE_TTL,
+        read_session=read_session,
+    )
+    if settings.ENTITY_CACHE_ENABLED:
+        repository = CachedRepository(repository, cache, namespace="items")
+    if settings.METRICS_ENABLED:
+        repository = InstrumentedRepository(repository, "items")
+    return repository
 
 
 def get_item_service(
-    repository: Annotated[ItemRepository, Depends(get_item_repository)],
+    repository: Annotated[IRepository[Item], Depends(get_item_repository)],
+    coalescer: Annotated[
+        WriteCoalescer[Item] | None, Depends(get_item_coalescer)
+    ] = None,
+    reads: Annotated[SingleFlight | None, Depends(get_item_reads)] = None,
 ) -> ItemService:
-    return ItemService(repository)
+    return ItemService(repository, coalescer, reads)
 
 
 # Type aliases for clean endpoint signatures
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
 ItemServiceDep = Annotated[ItemService, Depends(get_item_service)]
+ItemFeedDep = Annotated[ChangeFeed, Depends(get_item_feed)]
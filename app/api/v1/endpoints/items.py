@@ -1,11 +1,175 @@
-from fastapi import APIRouter, Query, status
+from datetime import datetime
+from typing import Any, Literal
 
-from app.api.v1.dependencies import ItemServiceDep
-from app.core.exceptions import NotFoundException
-from app.schemas.base import PaginatedResponse
-from app.schemas.item import ItemCreate, ItemResponse, ItemUpdate
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import (
+    ItemFeedDep,
+    ItemServiceDep,
+    SessionDep,
+    item_admission,
+)
+from app.config import settings
+from app.core.admission import admission_dependency
+from app.core.conditional import (
+    check_if_match,
+    is_conditional,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    validator_headers,
+)
+from app.core.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    PreconditionFailedException,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import json_response, row_dicts
+from app.core.streaming import (
+    csv_records,
+    csv_stream,
+    ndjson_records,
+    ndjson_stream,
+    sse_stream,
+)
+from app.schemas.base import (
+    BulkDeleteRequest,
+    BulkDeleteResponse,
+    BulkError,
+    BulkResponse,
+    ImportRecordError,
+    ImportSummary,
+    PaginatedResponse,
+)
+from app.schemas.item import (
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemFieldsResponse,
+    ItemResponse,
+    ItemSort,
+    ItemStatsResponse,
+    ItemUpdate,
+)
+from app.services.item import ItemService
+
+router = APIRouter(
+    prefix="/items",
+    tags=["Items"],
+    dependencies=[Depends(admission_dependency(item_admission), scope="request")],
+)
+
+# Columns every sparse row needs for the ETag and Last-Modified validators
+_VALIDATOR_FIELDS = ("id", "version", "updated_at")
 
-router = APIRouter(prefix="/items", tags=["Items"])
+
+# Inserts and commits one chunk, so every chunk is its own transaction
+async def _import_chunk(
+    service: ItemService, session: AsyncSession, chunk: list[ItemCreate]
+) -> int:
+    created = await service.create_many(chunk)
+    await session.commit()
+    return len(created)
+
+
+# Parses ?fields=; None means the full representation
+def _parse_fields(fields: str | None) -> list[str] | None:
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    if not names:
+        raise BadRequestException("No fields requested")
+    for name in names:
+        if name not in ItemResponse.model_fields:
+            raise BadRequestException(f"Unknown field: {name}")
+    return names
+
+
+# Parses ?ids=1,2,3 into unique ids, in the order requested
+def _parse_ids(ids: str) -> list[int]:
+    try:
+        wanted = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise BadRequestException(
+            "Invalid ids: expected comma-separated integers"
+        ) from None
+    if not wanted:
+        raise BadRequestException("No ids requested")
+    _check_batch_size(len(wanted))
+    return wanted
+
+
+# Each sparse fieldset is its own representation with its own validator
+def _item_etag(item_id: int, version: int, fields: list[str] | None = None) -> str:
+    return make_etag(item_id, version, *(fields or ()))
+
+
+# A page validator covers the query, every row version on it and the total
+def _page_etag(
+    request: Request, versions: list[tuple[int, int, datetime]], total: int | None
+) -> str:
+    return make_etag(request.url.query, total, *(f"{i}@{v}" for i, v, _ in versions))
+
+
+# Enforces If-Match against the current row version (read on the primary) and
+# returns that version, for the write to require it atomically; None when the
+# request is unconditional
+async def _check_item_precondition(
+    request: Request, service: ItemService, item_id: int
+) -> int | None:
+    if "if-match" not in request.headers:
+        return None
+    current = await service.version(item_id, primary=True)
+    if current is None:
+        raise NotFoundException("Item", item_id)
+    version, _ = current
+    check_if_match(request, _item_etag(item_id, version))
+    return version
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.BULK_MAX_BATCH_SIZE:
+        raise BadRequestException(
+            f"Batch size exceeds the maximum of {settings.BULK_MAX_BATCH_SIZE}"
+        )
+
+
+# Multi-get: one WHERE id IN (...) query, items in the requested order and
+# missing ids left out
+async def _items_by_ids(
+    request: Request, service: ItemService, ids: list[int], selected: list[str] | None
+) -> Response:
+    found = {item.id: item for item in await service.get_many(ids)}
+    rows = row_dicts([found[i] for i in ids if i in found])
+    versions = [(row["id"], row["version"], row["updated_at"]) for row in rows]
+    etag = _page_etag(request, versions, len(rows))
+    last_modified = max((ts for _, _, ts in versions), default=None)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    headers = validator_headers(etag, last_modified)
+    page = {
+        "items": rows,
+        "total": len(rows),
+        "skip": 0,
+        "limit": len(ids),
+        "next_cursor": None,
+    }
+    if selected is None:
+        return json_response(PaginatedResponse[ItemResponse], page, headers=headers)
+    page["items"] = [{name: row[name] for name in selected} for row in rows]
+    return json_response(
+        PaginatedResponse[ItemFieldsResponse], page, headers, exclude_unset=True
+    )
+
+
+def _format_errors(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'record'}: {e['msg']}"
+        for e in exc.errors()
+    )
 
 
 @router.post(
@@ -20,37 +184,345 @@ async def create_item(data: ItemCreate, service: ItemServiceDep) -> ItemResponse
     return ItemResponse.model_validate(item)
 
 
+# Also served without the trailing slash (GET /items?ids=1,2,3): the static
+# mount at "/" would otherwise answer before the slash redirect
+@router.get("", include_in_schema=False)
 @router.get(
     "/",
     response_model=PaginatedResponse[ItemResponse],
     summary="List items",
-    description="Returns a paginated list of all items.",
+    description=(
+        "Returns a paginated list of items (offset or cursor based), or the "
+        "items with the given ids."
+    ),
 )
 async def list_items(
+    request: Request,
     service: ItemServiceDep,
     skip: int = Query(0, ge=0, description="Records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Max records to return"),
-) -> PaginatedResponse[ItemResponse]:
-    items = await service.list(skip=skip, limit=limit)
-    total = await service._repository.count()
-    return PaginatedResponse(
+    cursor: str | None = Query(None, description="Cursor from a previous page"),
+    include_total: bool = Query(True, description="Compute the total count"),
+    is_active: bool | None = Query(None, description="Filter by active flag"),
+    min_price: float | None = Query(None, ge=0, description="Minimum price"),
+    max_price: float | None = Query(None, ge=0, description="Maximum price"),
+    name_prefix: str | None = Query(None, min_length=1, description="Name prefix"),
+    sort: ItemSort = Query("id", description="Sort field, '-' for descending"),
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return, e.g. id,name,price"
+    ),
+    ids: str | None = Query(
+        None, description="Comma-separated ids to fetch; paging and filters ignored"
+    ),
+) -> Response:
+    selected = _parse_fields(fields)
+    if ids is not None:
+        return await _items_by_ids(request, service, _parse_ids(ids), selected)
+    after = decode_cursor(cursor, sort) if cursor else None
+    where = {
+        "is_active": is_active,
+        "min_price": min_price,
+        "max_price": max_price,
+        "name_prefix": name_prefix,
+    }
+    total = await service.total(where) if include_total else None
+    if is_conditional(request):
+        # Cheap (id, version, updated_at) probe first; rows are only loaded on a miss
+        versions = await service.page_versions(
+            skip=skip, limit=limit, after=after, filters=where, sort=sort
+        )
+        etag = _page_etag(request, versions, total)
+        last_modified = max((ts for _, _, ts in versions), default=None)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+    if selected is None:
+        rows = await service.list_rows(
+            skip=skip, limit=limit, after=after, filters=where, sort=sort
+        )
+    else:
+        rows = await service.list_fields(
+            [*selected, *_VALIDATOR_FIELDS],
+            skip=skip,
+            limit=limit,
+            after=after,
+            filters=where,
+            sort=sort,
+        )
+    versions = [(row["id"], row["version"], row["updated_at"]) for row in rows]
+    headers = validator_headers(
+        _page_etag(request, versions, total),
+        max((ts for _, _, ts in versions), default=None),
+    )
+    next_values = service.next_cursor(rows, limit, sort)
+    page = {
+        "items": rows,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": encode_cursor(next_values, sort) if next_values else None,
+    }
+    if selected is None:
+        return json_response(PaginatedResponse[ItemResponse], page, headers=headers)
+    page["items"] = [{name: row[name] for name in selected} for row in rows]
+    return json_response(
+        PaginatedResponse[ItemFieldsResponse], page, headers, exclude_unset=True
+    )
+
+
+@router.get(
+    "/search",
+    response_model=PaginatedResponse[ItemResponse],
+    summary="Search items",
+    description="Full-text search over name and description, best matches first.",
+)
+async def search_items(
+    service: ItemServiceDep,
+    q: str = Query(..., min_length=1, max_length=255, description="Search text"),
+    limit: int = Query(100, ge=1, le=1000, description="Max records to return"),
+    cursor: str | None = Query(None, description="Cursor from a previous page"),
+) -> Response:
+    after = decode_cursor(cursor, "rank") if cursor else None
+    hits = await service.search(q, limit=limit, after=after)
+    next_cursor = None
+    if len(hits) == limit:
+        item, rank = hits[-1]
+        next_cursor = encode_cursor([rank, item.id], "rank")
+    page = {
+        "items": row_dicts([item for item, _ in hits]),
+        "total": None,
+        "skip": 0,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    }
+    return json_response(PaginatedResponse[ItemResponse], page)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export items",
+    description="Streams every item as NDJSON or CSV using a server-side cursor.",
+)
+async def export_items(
+    service: ItemServiceDep,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+) -> StreamingResponse:
+    chunks = service.stream(settings.EXPORT_CHUNK_SIZE)
+    if format == "csv":
+        body, media_type = csv_stream(chunks, ItemResponse), "text/csv"
+    else:
+        body, media_type = ndjson_stream(chunks, ItemResponse), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'},
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=ItemStatsResponse,
+    summary="Item statistics",
+    description=(
+        "Count and price sum/avg/min/max, overall and by active flag, read from "
+        "a summary table kept current by database triggers."
+    ),
+)
+async def item_stats(service: ItemServiceDep) -> ItemStatsResponse:
+    return ItemStatsResponse.model_validate(await service.stats())
+
+
+# Holds no database session: subscribers only wait on the in-process feed
+@router.get(
+    "/changes",
+    response_class=StreamingResponse,
+    summary="Item change feed",
+    description=(
+        "Server-Sent Events for created, updated and deleted items, published "
+        "after commit. Reconnects resume from Last-Event-ID."
+    ),
+)
+async def item_changes(
+    feed: ItemFeedDep,
+    last_event_id: str | None = Header(None, description="Last event received"),
+) -> StreamingResponse:
+    return StreamingResponse(
+        sse_stream(
+            feed,
+            feed.resume_from(last_event_id),
+            settings.CHANGE_FEED_HEARTBEAT_SECONDS,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ImportSummary,
+    summary="Import items",
+    description="Streams an NDJSON or CSV upload into the database in chunks.",
+)
+async def import_items(
+    request: Request,
+    service: ItemServiceDep,
+    session: SessionDep,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Input format"),
+) -> ImportSummary:
+    parse = csv_records if format == "csv" else ndjson_records
+    summary = ImportSummary(inserted=0, rejected=0, errors=[])
+    chunk: list[ItemCreate] = []
+    records = parse(request.stream(), settings.IMPORT_MAX_RECORD_SIZE)
+    async for line, record, error in records:
+        if error is None:
+            try:
+                chunk.append(ItemCreate.model_validate(record))
+            except ValidationError as exc:
+                error = _format_errors(exc)
+        if error is not None:
+            summary.rejected += 1
+            if len(summary.errors) < settings.IMPORT_MAX_ERRORS:
+                summary.errors.append(ImportRecordError(line=line, detail=error))
+        elif len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+            summary.inserted += await _import_chunk(service, session, chunk)
+            chunk = []
+    if chunk:
+        summary.inserted += await _import_chunk(service, session, chunk)
+    return summary
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResponse[ItemResponse],
+    summary="Bulk create items",
+    description="Creates many items in one batched insert, reporting invalid records.",
+)
+async def bulk_create_items(
+    service: ItemServiceDep, records: list[Any] = Body(...)
+) -> BulkResponse[ItemResponse]:
+    _check_batch_size(len(records))
+    valid: list[ItemCreate] = []
+    errors: list[BulkError] = []
+    for index, record in enumerate(records):
+        try:
+            valid.append(ItemCreate.model_validate(record))
+        except ValidationError as exc:
+            errors.append(BulkError(index=index, detail=_format_errors(exc)))
+    items = await service.create_many(valid)
+    return BulkResponse(
+        items=[ItemResponse.model_validate(i) for i in items], errors=errors
+    )
+
+
+@router.put(
+    "/bulk",
+    response_model=BulkResponse[ItemResponse],
+    summary="Bulk update items",
+    description="Updates many items by id in one batch, reporting failed records.",
+)
+async def bulk_update_items(
+    service: ItemServiceDep, records: list[Any] = Body(...)
+) -> BulkResponse[ItemResponse]:
+    _check_batch_size(len(records))
+    changes: dict[int, ItemUpdate] = {}
+    indexes: dict[int, int] = {}
+    errors: list[BulkError] = []
+    for index, record in enumerate(records):
+        try:
+            entry = ItemBulkUpdate.model_validate(record)
+        except ValidationError as exc:
+            errors.append(BulkError(index=index, detail=_format_errors(exc)))
+            continue
+        if entry.id in changes:
+            errors.append(BulkError(index=index, id=entry.id, detail="Duplicate id"))
+            continue
+        changes[entry.id] = ItemUpdate.model_validate(
+            entry.model_dump(exclude={"id"}, exclude_unset=True)
+        )
+        indexes[entry.id] = index
+    items = await service.update_many(changes)
+    found = {item.id for item in items}
+    errors.extend(
+        BulkError(
+            index=indexes[item_id],
+            id=item_id,
+            detail=NotFoundException("Item", item_id).detail,
+        )
+        for item_id in changes
+        if item_id not in found
+    )
+    return BulkResponse(
         items=[ItemResponse.model_validate(i) for i in items],
-        total=total,
-        skip=skip,
-        limit=limit,
+        errors=sorted(errors, key=lambda e: e.index),
     )
 
 
+@router.delete(
+    "/bulk",
+    response_model=BulkDeleteResponse,
+    summary="Bulk delete items",
+    description="Removes many items by id in a single statement.",
+)
+async def bulk_delete_items(
+    data: BulkDeleteRequest, service: ItemServiceDep
+) -> BulkDeleteResponse:
+    _check_batch_size(len(data.ids))
+    deleted = set(await service.delete_many(data.ids))
+    errors = [
+        BulkError(
+            index=index,
+            id=item_id,
+            detail=NotFoundException("Item", item_id).detail,
+        )
+        for index, item_id in enumerate(data.ids)
+        if item_id not in deleted
+    ]
+    return BulkDeleteResponse(deleted=sorted(deleted), errors=errors)
+
+
 @router.get(
     "/{item_id}",
     response_model=ItemResponse,
     summary="Get item",
     description="Returns a single item by its ID.",
 )
-async def get_item(item_id: int, service: ItemServiceDep) -> ItemResponse:
+async def get_item(
+    item_id: int,
+    request: Request,
+    response: Response,
+    service: ItemServiceDep,
+    fields: str | None = Query(
+        None, description="Comma-separated fields to return, e.g. id,name,price"
+    ),
+) -> ItemResponse | Response:
+    selected = _parse_fields(fields)
+    if is_conditional(request):
+        current = await service.version(item_id)
+        if current is None:
+            raise NotFoundException("Item", item_id)
+        version, updated_at = current
+        etag = _item_etag(item_id, version, selected)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+    if selected is not None:
+        row = await service.get_fields(item_id, [*selected, *_VALIDATOR_FIELDS])
+        if row is None:
+            raise NotFoundException("Item", item_id)
+        headers = validator_headers(
+            _item_etag(item_id, row["version"], selected), row["updated_at"]
+        )
+        return json_response(
+            ItemFieldsResponse,
+            {name: row[name] for name in selected},
+            headers,
+            exclude_unset=True,
+        )
     item = await service.get(item_id)
     if not item:
         raise NotFoundException("Item", item_id)
+    response.headers.update(
+        validator_headers(_item_etag(item.id, item.version), item.updated_at)
+    )
     return ItemResponse.model_validate(item)
 
 
@@ -61,11 +533,22 @@ async def get_item(item_id: int, service: ItemServiceDep) -> ItemResponse:
     description="Updates an existing item with the provided data.",
 )
 async def update_item(
-    item_id: int, data: ItemUpdate, service: ItemServiceDep
+    item_id: int,
+    data: ItemUpdate,
+    request: Request,
+    response: Response,
+    service: ItemServiceDep,
 ) -> ItemResponse:
-    item = await service.update(item_id, data)
+    expected = await _check_item_precondition(request, service, item_id)
+    item = await service.update(item_id, data, expected)
     if not item:
+        # A concurrent write changed (or removed) the row after the check
+        if expected is not None:
+            raise PreconditionFailedException()
         raise NotFoundException("Item", item_id)
+    response.headers.update(
+        validator_headers(_item_etag(item.id, item.version), item.updated_at)
+    )
     return ItemResponse.model_validate(item)
 
 
@@ -75,7 +558,10 @@ async def update_item(
     summary="Delete item",
     description="Permanently removes an item by its ID.",
 )
-async def delete_item(item_id: int, service: ItemServiceDep) -> None:
-    deleted = await service.delete(item_id)
+async def delete_item(item_id: int, request: Request, service: ItemServiceDep) -> None:
+    expected = await _check_item_precondition(request, service, item_id)
+    deleted = await service.delete(item_id, expected)
     if not deleted:
+        if expected is not None:
+            raise PreconditionFailedException()
         raise NotFoundException("Item", item_id)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,80 @@ class Settings(BaseSettings):
     APP_TITLE: str = "CRUD API"
     APP_VERSION: str = "1.0.0"
 
+    # Optional read replicas (comma-separated URLs) and how reads pick one
+    READ_DATABASE_URLS: str = ""
+    READ_ROUTING: Literal["round_robin", "least_busy"] = "round_robin"
+
+    # Connection pool (ignored for in-memory SQLite, which uses a single connection)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 500
+
+    # SQLite pragmas applied on every new connection (empty/0 leaves the default)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64_000
+    SQLITE_MMAP_SIZE: int = 268_435_456
+
+    # How list endpoints compute `total`: exact COUNT(*), TTL-cached, or omitted
+    COUNT_STRATEGY: Literal["exact", "cached", "none"] = "exact"
+    COUNT_CACHE_TTL: float = 30.0
+
+    # Read-through cache for single-entity lookups (get_by_id)
+    ENTITY_CACHE_ENABLED: bool = False
+    ENTITY_CACHE_MAX_SIZE: int = 10_000
+    ENTITY_CACHE_TTL: float = 60.0
+
+    # Maximum number of records accepted by a single bulk request
+    BULK_MAX_BATCH_SIZE: int = 1000
+
+    # Rows fetched per server-side cursor round trip when exporting
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Records inserted (and committed) per transaction when importing
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000
+    # Longest accepted import record in characters (a CSV record may span lines)
+    IMPORT_MAX_RECORD_SIZE: int = 1_048_576
+
+    # Group commit for concurrent single-item creates (POST /items/): requests
+    # arriving within the window, up to the batch size, share one transaction
+    WRITE_COALESCING_ENABLED: bool = False
+    WRITE_COALESCING_WINDOW_MS: float = 2.0
+    WRITE_COALESCING_MAX_BATCH: int = 64
+
+    # Singleflight for item reads (get, list pages and their totals): identical
+    # concurrent queries share one execution and its result, never anything older
+    READ_COALESCING_ENABLED: bool = False
+
+    # SSE change feed: events kept per table for Last-Event-ID resumes, and the
+    # keep-alive interval for idle subscribers
+    CHANGE_FEED_BUFFER_SIZE: int = 1000
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = 15.0
+
+    # Admission control for item routes: concurrent requests per budget (shared
+    # read/write budgets, or per route name), bounded wait queue and queue-time
+    # deadline; shed requests get 503 with Retry-After
+    ADMISSION_ENABLED: bool = False
+    ADMISSION_READ_LIMIT: int = 32
+    ADMISSION_WRITE_LIMIT: int = 8
+    ADMISSION_ROUTE_LIMITS: dict[str, int] = {}
+    ADMISSION_EXEMPT_ROUTES: list[str] = ["item_changes"]
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_MS: float = 500.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Startup schema handling: verify the Alembic head (production), create
+    # tables from the models (local development only) or do nothing
+    SCHEMA_MODE: Literal["check", "create_all", "skip"] = "check"
+
+    # Per-request SQL timing (Server-Timing header) and Prometheus /metrics
+    METRICS_ENABLED: bool = True
+
     model_config = {"env_file": ".env", "extra": "ignore"}
 
 
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from contextlib import asynccontextmanager
+
+from fastapi import Request
+
+from app.core.exceptions import ServiceUnavailableException
+from app.core.metrics import ADMISSION_REJECTED, ADMISSION_WAIT_SECONDS
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AdmissionRejectedError(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+# Concurrency limit with a bounded FIFO wait queue and a queue-time deadline.
+# A released slot is handed straight to the oldest waiter, so queued requests
+# cannot be overtaken by new arrivals.
+class Limiter:
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float) -> None:
+        self.name = name
+        self.limit = limit
+        self._max_queue = max_queue
+        self._timeout = timeout
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+        if len(self._waiters) >= self._max_queue:
+            raise AdmissionRejectedError("queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self._timeout):
+                await waiter
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the deadline fired
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                raise AdmissionRejectedError("timeout") from None
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+
+# Admission budgets: one per route with an explicit limit, otherwise shared
+# "read" (GET/HEAD/OPTIONS) and "write" budgets
+class AdmissionController:
+    def __init__(
+        self,
+        read_limit: int,
+        write_limit: int,
+        max_queue: int,
+        timeout: float,
+        retry_after: int = 1,
+        route_limits: Mapping[str, int] | None = None,
+        exempt_routes: frozenset[str] = frozenset(),
+        enabled: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.retry_after = retry_after
+        self.exempt_routes = exempt_routes
+        self._limiters = {
+            name: Limiter(name, limit, max_queue, timeout)
+            for name, limit in {
+                "read": read_limit,
+                "write": write_limit,
+                **(route_limits or {}),
+            }.items()
+        }
+
+    def limiter(self, route: str, method: str) -> Limiter:
+        limiter = self._limiters.get(route)
+        if limiter is None:
+            limiter = self._limiters["read" if method in _READ_METHODS else "write"]
+        return limiter
+
+    @asynccontextmanager
+    async def admit(self, route: str, method: str) -> AsyncIterator[None]:
+        limiter = self.limiter(route, method)
+        started = time.perf_counter()
+        try:
+            await limiter.acquire()
+        except AdmissionRejectedError as exc:
+            ADMISSION_REJECTED.inc((limiter.name, exc.reason))
+            raise ServiceUnavailableException(self.retry_after) from None
+        ADMISSION_WAIT_SECONDS.observe((limiter.name,), time.perf_counter() - started)
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    # (budget, state) -> value, read by the metrics gauge at scrape time
+    def usage(self) -> Iterator[tuple[tuple[str, str], float]]:
+        for name, limiter in self._limiters.items():
+            yield (name, "in_flight"), limiter.in_flight
+            yield (name, "queued"), limiter.queued
+            yield (name, "limit"), limiter.limit
+
+
+# Request-scoped admission dependency for a router. Router dependencies are
+# solved before the route's own, so a shed request never opens a session or
+# waits for a pooled connection. Being request-scoped, the slot is released
+# in teardown: after the response (including a streamed body) is sent and
+# after the route's other dependencies, e.g. get_session's commit, exit.
+def admission_dependency(
+    controller: AdmissionController,
+) -> Callable[[Request], AsyncIterator[None]]:
+    async def admit(request: Request) -> AsyncIterator[None]:
+        route = getattr(request.scope.get("route"), "name", None) or "unmatched"
+        if not controller.enabled or route in controller.exempt_routes:
+            yield
+            return
+        async with controller.admit(route, request.method):
+            yield
+
+    return admit
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+from collections import deque
+from collections.abc import Iterable
+
+# Committed change: (table, action, entity id)
+Change = tuple[str, str, int]
+
+RESET = "reset"
+
+
+# In-process change feed for one table. Every event gets the next sequence
+# number and is encoded once into its SSE frame, which all subscribers share.
+# A bounded buffer serves resumes (Last-Event-ID); idle subscribers cost one
+# pending future each, all woken together by the next publish.
+class ChangeFeed:
+    def __init__(self, name: str, buffer_size: int = 1000) -> None:
+        self.name = name
+        # Event ids are "<epoch>-<seq>", so ids from before a restart are
+        # recognised as stale instead of silently matching new events
+        self.epoch = format(time.time_ns(), "x")
+        self._seq = 0
+        self._buffer: deque[tuple[int, bytes]] = deque(maxlen=buffer_size)
+        self._waiters: set[asyncio.Future[None]] = set()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def _frame(self, seq: int, action: str, data: dict) -> bytes:
+        payload = json.dumps(data, separators=(",", ":"))
+        return (
+            f"id: {self.event_id(seq)}\nevent: {action}\ndata: {payload}\n\n".encode()
+        )
+
+    def publish(self, action: str, entity_id: int) -> None:
+        self._seq += 1
+        data = {"seq": self._seq, "entity": self.name, "id": entity_id}
+        self._buffer.append((self._seq, self._frame(self._seq, action, data)))
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+    # Tells a (re)connecting client to reload its state and resume from here
+    def reset_frame(self) -> bytes:
+        return self._frame(self._seq, RESET, {"seq": self._seq, "entity": self.name})
+
+    # Position to resume from: the head for new subscribers, the sequence of
+    # a known Last-Event-ID, or None when that id is foreign or too old
+    def resume_from(self, last_event_id: str | None) -> int | None:
+        if last_event_id is None:
+            return self._seq
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        return int(seq) if self._available(int(seq)) else None
+
+    def _available(self, seq: int) -> bool:
+        oldest = self._buffer[0][0] if self._buffer else self._seq + 1
+        return seq >= oldest - 1
+
+    # Frames published after `seq`; None when some were already evicted
+    def since(self, seq: int) -> list[bytes] | None:
+        if not self._available(seq):
+            return None
+        # Indexed from the right end, so catching up costs O(missed events)
+        return [self._buffer[-n][1] for n in range(self._seq - seq, 0, -1)]
+
+    # Returns once something is published after `seq`
+    async def wait(self, seq: int) -> None:
+        if self._seq > seq:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await waiter
+        finally:
+            self._waiters.discard(waiter)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._waiters)
+
+
+class ChangeFeeds:
+    def __init__(self, buffer_size: int = 1000) -> None:
+        self._buffer_size = buffer_size
+        self._feeds: dict[str, ChangeFeed] = {}
+
+    def get(self, name: str) -> ChangeFeed:
+        feed = self._feeds.get(name)
+        if feed is None:
+            feed = self._feeds[name] = ChangeFeed(name, self._buffer_size)
+        return feed
+
+    def publish(self, changes: Iterable[Change]) -> None:
+        for table, action, entity_id in changes:
+            self.get(table).publish(action, entity_id)
@@ -22,6 +22,22 @@ class BadRequestException(HTTPException):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
 
+# Raised when an If-Match precondition does not hold
+class PreconditionFailedException(HTTPException):
+    def __init__(self, detail: str = "Resource has been modified"):
+        super().__init__(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=detail)
+
+
+# Raised when a request is shed under load; clients should retry later
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, retry_after: int = 1, detail: str = "Server busy, retry later"):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 # Global handler for unhandled exceptions
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     return JSONResponse(
@@ -0,0 +1,47 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# DataLoader-style batching: keys requested in the same event-loop tick are
+# resolved by one call to `batch_fn`, and a key already in flight is shared.
+# Results are not cached past the batch, so reads after a write see it.
+class BatchLoader(Generic[K, V]):
+    def __init__(self, batch_fn: Callable[[list[K]], Awaitable[Mapping[K, V]]]):
+        self._batch_fn = batch_fn
+        self._pending: dict[K, asyncio.Future[V | None]] = {}
+        self._batches: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V | None:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        # Shielded: one cancelled caller must not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._resolve(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _resolve(self, batch: dict[K, asyncio.Future[V | None]]) -> None:
+        try:
+            found = await self._batch_fn(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                future.set_exception(exc)
+            return
+        except BaseException:
+            # A cancelled batch must not leave its callers waiting forever
+            for future in batch.values():
+                future.cancel()
+            raise
+        for key, future in batch.items():
+            future.set_result(found.get(key))
@@ -0,0 +1,300 @@
+import math
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from contextvars import ContextVar
+from typing import Protocol, TypeVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Labels = tuple[str, ...]
+
+_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Labels, values: Labels, *extra: str) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    return "{" + ",".join([*pairs, *extra]) + "}" if pairs or extra else ""
+
+
+class Metric(Protocol):
+    name: str
+
+    def render(self) -> Iterable[str]: ...
+
+
+# Prometheus histogram; observe() is a bisect plus two increments
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Labels,
+        buckets: tuple[float, ...] = _LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._labels = labels
+        self._buckets = buckets
+        self._counts: dict[Labels, list[int]] = {}
+        self._sums: dict[Labels, float] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self._buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self._buckets, value)] += 1
+        self._sums[labels] += value
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._sums.clear()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip((*self._buckets, math.inf), counts, strict=True):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else str(bound)
+                label_set = _format_labels(self._labels, labels, f'le="{le}"')
+                yield f"{self.name}_bucket{label_set} {cumulative}"
+            label_set = _format_labels(self._labels, labels)
+            yield f"{self.name}_sum{label_set} {self._sums[labels]}"
+            yield f"{self.name}_count{label_set} {cumulative}"
+
+
+# Monotonic counter per label set
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Labels) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._labels = labels
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels) -> float:
+        return self._values.get(labels, 0)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self._labels, labels)} {value}"
+
+
+# Gauge read from a callback at scrape time (e.g. pool utilization)
+class CallbackGauge:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Labels,
+        collect: Callable[[], Iterable[tuple[Labels, float]]],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._labels = labels
+        self._collect = collect
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in self._collect():
+            yield f"{self.name}{_format_labels(self._labels, labels)} {value}"
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        self._metrics[metric.name] = metric
+        return metric
+
+    # Prometheus text exposition format
+    def render(self) -> str:
+        lines = [line for m in self._metrics.values() for line in m.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time until the response started, per route name.",
+        ("method", "route", "status"),
+    )
+)
+REQUEST_DB_SECONDS = registry.register(
+    Histogram(
+        "http_request_db_seconds",
+        "Time spent executing SQL per request, per route name.",
+        ("route",),
+    )
+)
+REQUEST_QUERIES = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements executed per request, per route name.",
+        ("route",),
+        _COUNT_BUCKETS,
+    )
+)
+REPOSITORY_SECONDS = registry.register(
+    Histogram(
+        "repository_method_duration_seconds",
+        "Wall time of repository method calls.",
+        ("repository", "method"),
+    )
+)
+POOL_WAIT_SECONDS = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pooled connection.",
+        ("engine",),
+    )
+)
+
+ADMISSION_WAIT_SECONDS = registry.register(
+    Histogram(
+        "admission_queue_wait_seconds",
+        "Time requests waited for an admission slot, per budget.",
+        ("budget",),
+    )
+)
+ADMISSION_REJECTED = registry.register(
+    Counter(
+        "admission_rejected_total",
+        "Requests shed with 503, per budget and reason (queue_full, timeout).",
+        ("budget", "reason"),
+    )
+)
+READ_COALESCING = registry.register(
+    Counter(
+        "read_coalescing_total",
+        "Service reads that ran a query (executed) or shared an identical "
+        "in-flight one (coalesced), per method.",
+        ("service", "method", "outcome"),
+    )
+)
+COALESCED_BATCH_SIZE = registry.register(
+    Histogram(
+        "write_coalescer_batch_size",
+        "Rows committed per coalesced write transaction.",
+        ("coalescer",),
+        (1, 2, 4, 8, 16, 32, 64, 128, 256),
+    )
+)
+
+
+# Per-request database counters, shared through a context variable
+class RequestStats:
+    __slots__ = ("queries", "db_time", "pool_wait")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f"pool;dur={self.pool_wait * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def record_query(elapsed: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+
+
+def record_pool_wait(engine: str, elapsed: float) -> None:
+    POOL_WAIT_SECONDS.observe((engine,), elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.pool_wait += elapsed
+
+
+# Low-cardinality route label: the matched route's name (e.g. "list_items"),
+# never the raw URL
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "name", None) or "unmatched"
+
+
+# Pure ASGI middleware: Server-Timing header plus per-route histograms
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        elapsed = 0.0
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal elapsed, status_code
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            route = _route_label(scope)
+            REQUEST_SECONDS.observe(
+                (scope["method"], route, str(status_code)),
+                elapsed or time.perf_counter() - started,
+            )
+            REQUEST_DB_SECONDS.observe((route,), stats.db_time)
+            REQUEST_QUERIES.observe((route,), stats.queries)
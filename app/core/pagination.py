@@ -0,0 +1,49 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from app.core.exceptions import BadRequestException
+
+_SCALARS = (int, float, str, datetime)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    raise TypeError(f"Unsupported cursor value: {type(value).__name__}")
+
+
+def _decode_value(obj: dict) -> Any:
+    if "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+# Encodes the sort key values of the last row into an opaque cursor token,
+# bound to the sort order it was produced for
+def encode_cursor(values: list[Any], sort: str = "id") -> str:
+    payload = json.dumps(
+        {"s": sort, "v": values}, default=_encode_value, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+# Decodes a cursor token back into sort key values, rejecting tampered tokens
+# and tokens issued for a different sort order
+def decode_cursor(token: str, sort: str = "id") -> list[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode())
+        payload = json.loads(raw, object_hook=_decode_value)
+        values = payload["v"] if payload["s"] == sort else None
+    except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError):
+        raise BadRequestException("Invalid cursor") from None
+    if (
+        not isinstance(values, list)
+        or not values
+        or not all(isinstance(v, _SCALARS) for v in values)
+    ):
+        raise BadRequestException("Invalid cursor")
+    return values
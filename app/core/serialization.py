@@ -0,0 +1,46 @@
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+from fastapi import Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import inspect
+
+
+# One compiled validator/serializer per response type, built on first use
+@cache
+def type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+# Loaded column values of ORM entities; reading the identity state dict skips
+# the instrumented attribute descriptors, the bulk of per-row cost
+def row_dicts(entities: Sequence[Any]) -> list[dict[str, Any]]:
+    return [inspect(entity).dict for entity in entities]
+
+
+# Reads ORM rows and encodes them to JSON bytes in a single pydantic-core pass,
+# without building intermediate response models in Python
+def dump_json(schema: Any, value: Any, exclude_unset: bool = False) -> bytes:
+    adapter = type_adapter(schema)
+    return adapter.dump_json(
+        adapter.validate_python(value, from_attributes=True),
+        exclude_unset=exclude_unset,
+    )
+
+
+# Pre-encoded JSON response; FastAPI passes Response objects through untouched,
+# so the body is not validated and serialized a second time
+def json_response(
+    schema: Any,
+    value: Any,
+    headers: dict[str, str] | None = None,
+    status_code: int = status.HTTP_200_OK,
+    exclude_unset: bool = False,
+) -> Response:
+    return Response(
+        dump_json(schema, value, exclude_unset),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,59 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from app.core.metrics import READ_COALESCING
+
+R = TypeVar("R")
+
+# Result of a flight whose caller was cancelled before the call finished
+_ABANDONED = object()
+
+
+# Singleflight: concurrent calls with the same method and arguments share one
+# execution and its result. Nothing outlives the flight, so a call that starts
+# after it finished runs again and results are never older than the flight.
+class SingleFlight:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._flights: dict[tuple[str, Hashable], asyncio.Future[Any]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    # `share` copies the result for callers that joined someone else's flight
+    async def do(
+        self,
+        method: str,
+        args: Hashable,
+        call: Callable[[], Awaitable[R]],
+        share: Callable[[R], R] | None = None,
+    ) -> R:
+        key = (method, args)
+        flight = self._flights.get(key)
+        if flight is not None:
+            # Shielded: a cancelled follower must not cancel the shared result
+            result = await asyncio.shield(flight)
+            if result is _ABANDONED:
+                return await self.do(method, args, call, share)
+            READ_COALESCING.inc((self.name, method, "coalesced"))
+            return share(result) if share is not None else result
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        READ_COALESCING.inc((self.name, method, "executed"))
+        try:
+            result = await call()
+        except Exception as exc:
+            flight.set_exception(exc)
+            # Retrieved here, so a flight nobody joined logs no warning
+            flight.exception()
+            raise
+        except BaseException:
+            # The call ran on the cancelled caller's session; followers retry
+            flight.set_result(_ABANDONED)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
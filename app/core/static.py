@@ -0,0 +1,71 @@
+import mimetypes
+import os
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Content-addressed names written by the static build: name.<10 hex>.ext
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{10}\.[^./]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Precompressed variants, in order of preference
+_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+# StaticFiles that serves precompressed .br/.gz siblings and sets caching
+# headers: hashed files are immutable, everything else revalidates by ETag.
+# FileResponse streams via the ASGI pathsend extension (zero-copy sendfile)
+# when the server offers it.
+class CachedStaticFiles(StaticFiles):
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        path = os.fspath(full_path)
+        media_type = mimetypes.guess_type(path)[0] or "text/plain"
+        headers = {
+            "Cache-Control": IMMUTABLE if _HASHED_NAME.search(path) else REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, suffix in _VARIANTS:
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(path + suffix)
+            except FileNotFoundError:
+                continue
+            path, stat_result = path + suffix, variant_stat
+            headers["Content-Encoding"] = encoding
+            break
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
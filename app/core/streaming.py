@@ -0,0 +1,242 @@
+import asyncio
+import codecs
+import csv
+import io
+import json
+from collections import deque
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.core.events import ChangeFeed
+
+# Parsed upload record: (line number, record, parse error)
+Record = tuple[int, dict[str, Any] | None, str | None]
+
+
+# Encodes chunks of entities as newline-delimited JSON, one chunk per write
+async def ndjson_stream(
+    chunks: AsyncIterator[Sequence[Any]], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield b"".join(
+            schema.model_validate(row).model_dump_json().encode() + b"\n"
+            for row in chunk
+        )
+
+
+# Encodes chunks of entities as CSV with a header row taken from the schema
+async def csv_stream(
+    chunks: AsyncIterator[Sequence[Any]], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    fields = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+    async for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            schema.model_validate(row).model_dump(mode="json") for row in chunk
+        )
+        yield buffer.getvalue().encode()
+
+
+# Server-Sent Events for one subscriber: missed frames first (or a reset when
+# `seq` is None or no longer buffered), then live ones, with a comment line
+# as keep-alive while idle
+async def sse_stream(
+    feed: ChangeFeed, seq: int | None, heartbeat: float
+) -> AsyncIterator[bytes]:
+    while True:
+        frames = None if seq is None else feed.since(seq)
+        # Advanced before yielding: anything published while these frames are
+        # being sent is picked up on the next pass
+        seq = feed.seq
+        if frames is None:
+            yield feed.reset_frame()
+        elif frames:
+            yield b"".join(frames)
+        try:
+            async with asyncio.timeout(heartbeat):
+                await feed.wait(seq)
+        except TimeoutError:
+            yield b": keep-alive\n\n"
+
+
+# Splits a byte stream into numbered text lines, one batch per chunk, without
+# buffering the whole body; lines over max_length come out as None and are
+# dropped as they arrive instead of being held in memory
+async def _line_batches(
+    chunks: AsyncIterator[bytes], max_length: int | None
+) -> AsyncIterator[list[tuple[int, str | None]]]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    dropping = False
+    number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        batch: list[tuple[int, str | None]] = []
+        for line in lines:
+            number += 1
+            batch.append((number, _fit(line, max_length, dropping)))
+            dropping = False
+        if max_length is not None and len(pending) > max_length:
+            pending, dropping = "", True
+        if batch:
+            yield batch
+    pending += decoder.decode(b"", final=True)
+    if pending or dropping:
+        yield [(number + 1, _fit(pending, max_length, dropping))]
+
+
+def _fit(line: str, max_length: int | None, dropping: bool) -> str | None:
+    if dropping or (max_length is not None and len(line) > max_length):
+        return None
+    return line.rstrip("\r")
+
+
+# Splits a byte stream into numbered text lines (None for lines over max_length)
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_length: int | None = None
+) -> AsyncIterator[tuple[int, str | None]]:
+    async for batch in _line_batches(chunks, max_length):
+        for item in batch:
+            yield item
+
+
+# Parses an NDJSON upload into records, skipping blank lines
+async def ndjson_records(
+    chunks: AsyncIterator[bytes], max_size: int | None = None
+) -> AsyncIterator[Record]:
+    async for number, line in iter_lines(chunks, max_size):
+        if line is None:
+            yield number, None, "Record too large"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield number, record, None
+
+
+class _NeedMoreError(Exception):
+    pass
+
+
+class _TooLargeError(csv.Error):
+    pass
+
+
+# Line source for a long-lived csv.reader: hands out the buffered lines and
+# remembers those of the record being parsed, so a record cut off at the end
+# of a chunk can be rewound and parsed again once more input arrives
+class _CsvLines:
+    def __init__(self, max_size: int | None) -> None:
+        self.lines: deque[tuple[int, str | None]] = deque()
+        self.record: list[tuple[int, str | None]] = []
+        self.size = 0
+        self.max_size = max_size
+        self.closed = False
+        self.failed = False
+
+    def __iter__(self) -> "_CsvLines":
+        return self
+
+    def __next__(self) -> str:
+        while self.lines:
+            number, line = self.lines.popleft()
+            # Blank lines between records are skipped
+            if not self.record and line is not None and not line.strip():
+                continue
+            self.record.append((number, line))
+            if line is not None:
+                self.size += len(line) + (len(self.record) > 1)
+            limit = self.max_size
+            if line is None or (limit is not None and self.size > limit):
+                raise _TooLargeError("Record too large")
+            return line + "\n"
+        if self.closed and not self.record:
+            raise StopIteration
+        raise _NeedMoreError
+
+    @property
+    def start(self) -> int:
+        return self.record[0][0]
+
+    def rewind(self) -> None:
+        self.lines.extendleft(reversed(self.record))
+        self.next_record()
+
+    def next_record(self) -> None:
+        self.record = []
+        self.size = 0
+
+
+# Yields the complete rows buffered in source as (start line, values, error)
+def _csv_rows(
+    reader: Iterator[list[str]], source: _CsvLines
+) -> Iterator[tuple[int, list[str], str | None]]:
+    while not source.failed:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return
+        except _NeedMoreError:
+            if source.closed:
+                source.failed = True
+                yield source.start, [], "Unterminated quoted field"
+            else:
+                source.rewind()
+            return
+        except csv.Error as exc:
+            # Past its first line a record is inside a quoted field, so where
+            # the next one starts is unknown and parsing stops here
+            start, source.failed = source.start, len(source.record) > 1
+            source.next_record()
+            yield start, [], str(exc)
+            continue
+        start = source.start
+        source.next_record()
+        yield start, values, None
+
+
+# Parses a CSV upload (header row first); quoted fields may span lines. One
+# csv.reader reads the whole upload, so a stray quote inside an unquoted field
+# stays literal; records over max_size are rejected
+async def csv_records(
+    chunks: AsyncIterator[bytes], max_size: int | None = None
+) -> AsyncIterator[Record]:
+    source = _CsvLines(max_size)
+    reader = csv.reader(source)
+    batches = _line_batches(chunks, max_size)
+    header: list[str] | None = None
+    while not source.closed and not source.failed:
+        batch = await anext(batches, None)
+        if batch is None:
+            source.closed = True
+        else:
+            source.lines.extend(batch)
+        for start, values, error in _csv_rows(reader, source):
+            if error is not None:
+                yield start, None, error
+            elif header is None:
+                header = values
+            elif len(values) != len(header):
+                yield start, None, f"Expected {len(header)} columns, got {len(values)}"
+            else:
+                # Empty cells fall back to the schema defaults
+                yield (
+                    start,
+                    {k: v for k, v in zip(header, values, strict=True) if v},
+                    None,
+                )
@@ -11,3 +11,6 @@ class Base(DeclarativeBase):
     updated_at: Mapped[datetime] = mapped_column(
         server_default=func.now(), onupdate=func.now()
     )
+    # Incremented by every write; ETags and If-Match compare it, because
+    # updated_at only has one-second resolution on SQLite
+    version: Mapped[int] = mapped_column(server_default="1")
@@ -0,0 +1,62 @@
+import re
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.base import Base
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+_REVISION = re.compile(r"^revision\s*(?::[^=]*)?=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\s*(?::[^=]*)?=(.*)$", re.MULTILINE)
+_REVISION_ID = re.compile(r"['\"](\w+)['\"]")
+
+
+class SchemaMismatchError(RuntimeError):
+    pass
+
+
+# Head revision(s) of the migration scripts shipped with this code, read from
+# the revision headers; importing alembic alone would cost more than the check
+def expected_heads(versions_dir: Path = MIGRATIONS_DIR / "versions") -> set[str]:
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for script in versions_dir.glob("*.py"):
+        source = script.read_text()
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down is not None:
+            parents.update(_REVISION_ID.findall(down.group(1)))
+    return revisions - parents
+
+
+async def current_heads(async_engine: AsyncEngine) -> set[str]:
+    async with async_engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except DBAPIError:
+            return set()
+        return set(result.scalars())
+
+
+# One query against alembic_version; fails fast instead of serving requests
+# against a schema the code was not written for
+async def check_schema(async_engine: AsyncEngine) -> None:
+    expected = expected_heads()
+    current = await current_heads(async_engine)
+    if current != expected:
+        raise SchemaMismatchError(
+            f"Database revision {sorted(current) or 'none'} does not match "
+            f"migration head {sorted(expected)}; run `alembic upgrade head`"
+        )
+
+
+# Dev mode: creates missing tables straight from the models, no migrations
+async def create_schema(async_engine: AsyncEngine) -> None:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
@@ -1,13 +1,254 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import inspect
+import itertools
+import time
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import asynccontextmanager
+from typing import Any, Literal
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.engine import ExceptionContext, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
 
 from app.config import settings
+from app.core.events import ChangeFeeds
+from app.core.metrics import CallbackGauge, record_pool_wait, record_query, registry
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+# Queue pool that reports how long each checkout waited for a connection
+# (including connecting, when the pool has to open a new one)
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_pool_wait(self.logging_name or "", time.perf_counter() - started)
+
+
+# Engine keyword arguments derived from the pool settings
+def engine_options(url: str) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "echo": settings.DEBUG,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "query_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if not _is_sqlite_memory(url):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+        if settings.METRICS_ENABLED:
+            options["poolclass"] = TimedQueuePool
+    return options
+
+
+# Applies the configured performance pragmas to a new SQLite connection
+def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        if value:
+            cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, many: bool
+) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, many: bool
+) -> None:
+    record_query(time.perf_counter() - conn.info["query_started"].pop())
+
+
+# after_cursor_execute does not fire for a failing statement: its start time
+# is popped (and its time recorded) here, so it does not stay on the pooled
+# connection for good
+def _handle_error(context: ExceptionContext) -> None:
+    conn = context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if started and context.statement is not None:
+        record_query(time.perf_counter() - started.pop())
+
+
+# Attributes SQL execution time and statement count to the current request
+def instrument_engine(async_engine: AsyncEngine) -> None:
+    sync_engine = async_engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# Creates an async engine with pool tuning and, for SQLite, connection pragmas
+def build_engine(url: str, name: str = "primary") -> AsyncEngine:
+    async_engine = create_async_engine(
+        url, pool_logging_name=name, **engine_options(url)
+    )
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        instrument_engine(async_engine)
+    return async_engine
+
+
+# Spreads read sessions across replica engines
+class ReplicaRouter:
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        strategy: Literal["round_robin", "least_busy"] = "round_robin",
+    ) -> None:
+        self._engines = engines
+        self._strategy = strategy
+        self._cycle = itertools.cycle(engines)
+        self._in_use = dict.fromkeys(engines, 0)
+
+    def choose(self) -> AsyncEngine:
+        if self._strategy == "least_busy":
+            return min(self._engines, key=self._in_use.__getitem__)
+        return next(self._cycle)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+        replica = self.choose()
+        self._in_use[replica] += 1
+        try:
+            async with AsyncSession(replica, expire_on_commit=False) as session:
+                yield session
+        finally:
+            self._in_use[replica] -= 1
+
+    async def dispose(self) -> None:
+        for replica in self._engines:
+            await replica.dispose()
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        return list(self._engines)
+
 
 # Async engine and session factory
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+engine = build_engine(settings.DATABASE_URL)
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
+# Read replicas, if configured; reads fall back to the primary otherwise
+_read_urls = [u.strip() for u in settings.READ_DATABASE_URLS.split(",") if u.strip()]
+read_router = (
+    ReplicaRouter(
+        [build_engine(u, f"replica{i}") for i, u in enumerate(_read_urls)],
+        settings.READ_ROUTING,
+    )
+    if _read_urls
+    else None
+)
+
+
+# Pool utilization per engine, read at scrape time
+def _pool_usage() -> Iterator[tuple[tuple[str, str], float]]:
+    engines = [engine, *(read_router.engines if read_router else [])]
+    for async_engine in engines:
+        pool = async_engine.sync_engine.pool
+        if isinstance(pool, QueuePool):
+            name = pool.logging_name or ""
+            yield (name, "size"), pool.size()
+            yield (name, "checked_out"), pool.checkedout()
+            yield (name, "overflow"), max(pool.overflow(), 0)
+
+
+registry.register(
+    CallbackGauge(
+        "db_pool_connections",
+        "Pooled connections by state (size, checked_out, overflow).",
+        ("engine", "state"),
+        _pool_usage,
+    )
+)
+
+
+# Per-table change feeds, fed by the writes each session records
+change_feeds = ChangeFeeds(settings.CHANGE_FEED_BUFFER_SIZE)
+
+
+# Awaitables returned by on_commit callbacks, referenced until they finish
+_commit_tasks: set[asyncio.Future[Any]] = set()
+
+
+# Recorded changes become visible to subscribers only once committed
+def _publish_changes(session: Session) -> None:
+    change_feeds.publish(session.info.pop("changes", ()))
+    for callback in session.info.pop("on_commit", ()):
+        result = callback()
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            _commit_tasks.add(task)
+            task.add_done_callback(_commit_tasks.discard)
+
+
+def _discard_changes(session: Session) -> None:
+    session.info.pop("changes", None)
+    session.info.pop("on_commit", None)
+
+
+event.listen(Session, "after_commit", _publish_changes)
+event.listen(Session, "after_rollback", _discard_changes)
+
+
+# Opens as many connections as the pool keeps, concurrently, so the first
+# requests after startup do not pay for connecting
+async def warm_pool(async_engine: AsyncEngine) -> None:
+    pool = async_engine.sync_engine.pool
+    size = pool.size() if isinstance(pool, QueuePool) else 1
+
+    async def ping() -> None:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(size)))
+
+
+_pools_warmed = False
+
+
+# Readiness: warms every pool on the first call, then only pings the primary
+async def ensure_ready() -> None:
+    global _pools_warmed
+    if _pools_warmed:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return
+    for async_engine in [engine, *(read_router.engines if read_router else [])]:
+        await warm_pool(async_engine)
+    _pools_warmed = True
+
 
 # Dependency that provides a database session per request
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -18,3 +259,12 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+# Dependency that provides a replica session per request (None without replicas)
+async def get_read_session() -> AsyncGenerator[AsyncSession | None, None]:
+    if read_router is None:
+        yield None
+        return
+    async with read_router.session() as session:
+        yield session
@@ -2,24 +2,37 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
+from app.api import monitoring
+from app.api.v1.dependencies import get_item_coalescer
 from app.api.v1.router import v1_router
 from app.config import settings
 from app.core.exceptions import global_exception_handler
-from app.db.base import Base
-from app.db.session import engine
+from app.core.metrics import MetricsMiddleware
+from app.core.static import CachedStaticFiles
+from app.db.schema import check_schema, create_schema
+from app.db.session import engine, read_router
 
 STATIC_DIR = Path(__file__).parent / "static"
+# Hashed, precompressed build (python -m scripts.build_static), used when present
+STATIC_BUILD_DIR = STATIC_DIR / "dist"
 
 
-# Creates tables on startup, disposes engine on shutdown
+# Verifies (or, in dev mode, creates) the schema on startup; on shutdown
+# commits creates still waiting for a group commit, then disposes engines
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if settings.SCHEMA_MODE == "check":
+        await check_schema(engine)
+    elif settings.SCHEMA_MODE == "create_all":
+        await create_schema(engine)
     yield
+    coalescer = get_item_coalescer()
+    if coalescer is not None:
+        await coalescer.drain()
     await engine.dispose()
+    if read_router is not None:
+        await read_router.dispose()
 
 
 app = FastAPI(
@@ -30,4 +43,15 @@ app = FastAPI(
 
 app.add_exception_handler(Exception, global_exception_handler)
 app.include_router(v1_router)
-app.mount("/", StaticFiles(directory=STATIC_DIR, html=True), name="static")
+app.include_router(monitoring.health_router)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(monitoring.router)
+app.mount(
+    "/",
+    CachedStaticFiles(
+        directory=STATIC_BUILD_DIR if STATIC_BUILD_DIR.is_dir() else STATIC_DIR,
+        html=True,
+    ),
+    name="static",
+)
@@ -1,4 +1,15 @@
-from sqlalchemy import Boolean, Float, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    Float,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    event,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -7,8 +18,131 @@ from app.db.base import Base
 # Example entity - replace or extend for your domain
 class Item(Base):
     __tablename__ = "items"
+    # Composite indexes backing the list filters/sorts; id makes keyset seeks exact
+    __table_args__ = (
+        Index("ix_items_name_id", "name", "id"),
+        Index("ix_items_price_id", "price", "id"),
+        Index("ix_items_created_at_id", "created_at", "id"),
+        Index("ix_items_is_active_price_id", "is_active", "price", "id"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     price: Mapped[float] = mapped_column(Float, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+
+# Full-text index over name/description, kept in sync by the database itself.
+# Mirrors the "add items full-text search" migration for create_all setups.
+ITEMS_FTS_SQLITE = [
+    "CREATE VIRTUAL TABLE items_fts USING fts5("
+    "name, description, content='items', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER items_fts_au AFTER UPDATE OF name, description ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO items_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+]
+ITEMS_FTS_POSTGRES = [
+    "ALTER TABLE items ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX ix_items_search_vector ON items USING GIN (search_vector)",
+]
+
+for _statement in ITEMS_FTS_SQLITE:
+    event.listen(
+        Item.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in ITEMS_FTS_POSTGRES:
+    event.listen(
+        Item.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    Item.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS items_fts").execute_if(dialect="sqlite"),
+)
+
+
+# Running item count and price sum per is_active value, kept current by
+# triggers on items so every write path (ORM, bulk, import, raw SQL) updates it
+# in the same transaction. Mirrors the "add item stats" migration.
+item_stats = Table(
+    "item_stats",
+    Base.metadata,
+    Column("is_active", Boolean, primary_key=True, autoincrement=False),
+    Column("item_count", Integer, nullable=False, server_default="0"),
+    Column("price_sum", Float, nullable=False, server_default="0"),
+)
+Item.__table__.add_is_dependent_on(item_stats)
+
+ITEM_STATS_SEED = (
+    "INSERT INTO item_stats (is_active, item_count, price_sum) "
+    "VALUES (false, 0, 0), (true, 0, 0)"
+)
+# Recomputes both summary rows from items (also used by the rebuild command)
+ITEM_STATS_REBUILD = [
+    "DELETE FROM item_stats",
+    ITEM_STATS_SEED,
+    "UPDATE item_stats SET "
+    "item_count = (SELECT COUNT(*) FROM items "
+    "WHERE items.is_active = item_stats.is_active), "
+    "price_sum = (SELECT COALESCE(SUM(price), 0) FROM items "
+    "WHERE items.is_active = item_stats.is_active)",
+]
+_STATS_ADD = (
+    "UPDATE item_stats SET item_count = item_count + 1, "
+    "price_sum = price_sum + new.price WHERE is_active = new.is_active; "
+)
+_STATS_SUBTRACT = (
+    "UPDATE item_stats SET item_count = item_count - 1, "
+    "price_sum = price_sum - old.price WHERE is_active = old.is_active; "
+)
+ITEM_STATS_SQLITE = [
+    f"CREATE TRIGGER item_stats_ai AFTER INSERT ON items BEGIN {_STATS_ADD}END",
+    f"CREATE TRIGGER item_stats_ad AFTER DELETE ON items BEGIN {_STATS_SUBTRACT}END",
+    "CREATE TRIGGER item_stats_au AFTER UPDATE OF price, is_active ON items "
+    f"BEGIN {_STATS_SUBTRACT}{_STATS_ADD}END",
+]
+ITEM_STATS_POSTGRES = [
+    "CREATE FUNCTION item_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$ "
+    "BEGIN "
+    "IF TG_OP IN ('UPDATE', 'DELETE') THEN "
+    f"{_STATS_SUBTRACT}"
+    "END IF; "
+    "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+    f"{_STATS_ADD}"
+    "END IF; "
+    "RETURN NULL; "
+    "END $$",
+    "CREATE TRIGGER item_stats_maintain "
+    "AFTER INSERT OR DELETE OR UPDATE OF price, is_active ON items "
+    "FOR EACH ROW EXECUTE FUNCTION item_stats_apply()",
+]
+
+event.listen(item_stats, "after_create", DDL(ITEM_STATS_SEED))
+for _statement in ITEM_STATS_SQLITE:
+    event.listen(
+        Item.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in ITEM_STATS_POSTGRES:
+    event.listen(
+        Item.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    item_stats,
+    "after_drop",
+    DDL("DROP FUNCTION IF EXISTS item_stats_apply()").execute_if(dialect="postgresql"),
+)
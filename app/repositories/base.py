@@ -1,54 +1,499 @@
-from typing import Generic, TypeVar
+import operator
+import sys
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any, ClassVar, Generic, Literal, TypeVar
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import BadRequestException
+from app.core.loader import BatchLoader
 from app.db.base import Base
 
 T = TypeVar("T", bound=Base)
 
+CountStrategy = Literal["exact", "cached", "none"]
+
+# Process-wide cached row counts per table: table name -> (expires_at, count)
+_count_cache: dict[str, tuple[float, int]] = {}
+
+
+# Case-sensitive prefix match as a range, so a plain B-tree index can serve it.
+# Trailing U+10FFFF has no successor: the bound moves to the previous character,
+# and a prefix made only of it has no upper bound at all. Surrogates can't be
+# encoded, so the successor of U+D7FF is U+E000
+def _starts_with(column: Any, prefix: str) -> ColumnElement[bool]:
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return column >= prefix
+    successor = ord(stem[-1]) + 1
+    if 0xD800 <= successor <= 0xDFFF:
+        successor = 0xE000
+    return and_(column >= prefix, column < stem[:-1] + chr(successor))
+
+
+_OPERATORS: dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "eq": operator.eq,
+    "ge": operator.ge,
+    "le": operator.le,
+    "prefix": _starts_with,
+}
+
 
 # Generic repository with full CRUD - extend for specific entities
 class BaseRepository(Generic[T]):
-    def __init__(self, session: AsyncSession, model: type[T]) -> None:
+    # Whitelisted list filters: filter name -> (column, operator from _OPERATORS)
+    filter_fields: ClassVar[dict[str, tuple[str, str]]] = {}
+    # Whitelisted sort columns (non-nullable); prefix with "-" for descending
+    sort_fields: ClassVar[tuple[str, ...]] = ("id",)
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        model: type[T],
+        *,
+        count_strategy: CountStrategy = "exact",
+        count_cache_ttl: float = 30.0,
+        read_session: AsyncSession | None = None,
+    ) -> None:
         self._session = session
+        self._read_session = read_session
         self._model = model
+        self._count_strategy = count_strategy
+        self._count_cache_ttl = count_cache_ttl
+        self._loader: BatchLoader[int, T] = BatchLoader(self._load_by_ids)
+
+    # Reads use the replica session, unless this unit of work already wrote
+    @property
+    def _reader(self) -> AsyncSession:
+        if self._read_session is None or self._session.info.get("has_writes"):
+            return self._session
+        return self._read_session
+
+    # Whether this unit of work has written (its reads must see those writes)
+    @property
+    def has_writes(self) -> bool:
+        return bool(self._session.info.get("has_writes"))
 
+    # Pins later reads of the same session to the primary (read-after-write)
+    def _mark_written(self) -> None:
+        self._session.info["has_writes"] = True
+
+    # Concurrent lookups in the same tick share one query (see BatchLoader)
     async def get_by_id(self, entity_id: int) -> T | None:
-        return await self._session.get(self._model, entity_id)
+        return await self._loader.load(entity_id)
+
+    # One WHERE id IN (...) query; ids that do not exist are skipped
+    async def get_many(self, entity_ids: Sequence[int]) -> list[T]:
+        if not entity_ids:
+            return []
+        query = (
+            select(self._model)
+            .where(self._model.id.in_(set(entity_ids)))
+            .order_by(self._model.id)
+        )
+        return list((await self._reader.scalars(query)).all())
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[T]:
-        query = select(self._model).offset(skip).limit(limit)
-        result = await self._session.execute(query)
+    # A lone id keeps Session.get, which answers from the identity map
+    async def _load_by_ids(self, entity_ids: list[int]) -> dict[int, T]:
+        if len(entity_ids) == 1:
+            entity = await self._reader.get(self._model, entity_ids[0])
+            return {entity_ids[0]: entity} if entity is not None else {}
+        return {entity.id: entity for entity in await self.get_many(entity_ids)}
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[T]:
+        query = self._list_query(skip, limit, after, filters, sort)
+        result = await self._reader.execute(query)
         return list(result.scalars().all())
 
-    async def count(self) -> int:
-        query = select(func.count(self._model.id))
-        result = await self._session.execute(query)
+    # Cheap validators: (version, updated_at) only, no row hydration. Write
+    # preconditions pass primary=True, as a replica may lag behind
+    async def get_version(
+        self, entity_id: int, primary: bool = False
+    ) -> tuple[int, datetime] | None:
+        query = select(self._model.version, self._model.updated_at).where(
+            self._model.id == entity_id
+        )
+        session = self._session if primary else self._reader
+        row = (await session.execute(query)).one_or_none()
+        return (row.version, row.updated_at) if row is not None else None
+
+    async def get_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[tuple[int, int, datetime]]:
+        query = self._list_query(skip, limit, after, filters, sort).with_only_columns(
+            self._model.id, self._model.version, self._model.updated_at
+        )
+        result = await self._reader.execute(query)
+        return [(row.id, row.version, row.updated_at) for row in result]
+
+    # Sparse fieldsets: only the named columns are selected and rows come back
+    # as plain mappings, without ORM hydration
+    async def get_fields(
+        self, entity_id: int, fields: Sequence[str]
+    ) -> dict[str, Any] | None:
+        query = select(*self._columns(fields)).where(self._model.id == entity_id)
+        row = (await self._reader.execute(query)).mappings().first()
+        return dict(row) if row is not None else None
+
+    # Sort key columns are always included so the next cursor can be built
+    async def get_all_fields(
+        self,
+        fields: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[dict[str, Any]]:
+        sort_keys = [column.key for column in self._sort_columns(sort)[0]]
+        query = self._list_query(skip, limit, after, filters, sort).with_only_columns(
+            *self._columns([*fields, *sort_keys])
+        )
+        return await self._fetch_dicts(query)
+
+    # Read-only page: every column, as plain dicts. No entities enter the
+    # identity map, so there is no instrumentation or change tracking per row
+    async def get_all_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[dict[str, Any]]:
+        query = self._list_query(skip, limit, after, filters, sort).with_only_columns(
+            *self._columns(inspect(self._model).column_attrs.keys())
+        )
+        return await self._fetch_dicts(query)
+
+    # Zipping keys with plain Row tuples is cheaper than RowMapping per row
+    async def _fetch_dicts(self, query: Select) -> list[dict[str, Any]]:
+        result = await self._reader.execute(query)
+        keys = list(result.keys())
+        return [dict(zip(keys, row, strict=True)) for row in result]
+
+    def _columns(self, fields: Sequence[str]) -> list[Any]:
+        known = inspect(self._model).column_attrs.keys()
+        for name in fields:
+            if name not in known:
+                raise BadRequestException(f"Unknown field: {name}")
+        return [getattr(self._model, name) for name in dict.fromkeys(fields)]
+
+    def _list_query(
+        self,
+        skip: int,
+        limit: int,
+        after: list[Any] | None,
+        filters: dict[str, Any] | None,
+        sort: str,
+    ) -> Select:
+        columns, descending = self._sort_columns(sort)
+        query = self._filter(select(self._model), filters).order_by(
+            *(column.desc() if descending else column for column in columns)
+        )
+        if after is not None:
+            query = self._seek(query, after, sort)
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    # Server-side cursor over the whole table, yielded in chunks of chunk_size
+    async def stream(self, chunk_size: int = 1000) -> AsyncIterator[list[T]]:
+        query = (
+            select(self._model)
+            .order_by(self._model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self._reader.stream_scalars(query)
+        async for chunk in result.partitions():
+            yield list(chunk)
+
+    # Sort key values of an entity or row mapping, used to build the cursor for
+    # the next page
+    def cursor_values(
+        self, entity: T | Mapping[str, Any], sort: str = "id"
+    ) -> list[Any]:
+        columns, _ = self._sort_columns(sort)
+        if isinstance(entity, Mapping):
+            return [entity[column.key] for column in columns]
+        return [getattr(entity, column.key) for column in columns]
+
+    # Columns defining page order; the primary key is the unique tiebreaker
+    def _sort_columns(self, sort: str) -> tuple[list[Any], bool]:
+        name = sort.removeprefix("-")
+        if name not in self.sort_fields:
+            raise BadRequestException(f"Unknown sort field: {name}")
+        columns = [getattr(self._model, name)]
+        if name != "id":
+            columns.append(self._model.id)
+        return columns, sort.startswith("-")
+
+    # Applies whitelisted filters; None values are ignored
+    def _filter(self, query: Select, filters: dict[str, Any] | None) -> Select:
+        for name, value in (filters or {}).items():
+            if value is None:
+                continue
+            if name not in self.filter_fields:
+                raise BadRequestException(f"Unknown filter: {name}")
+            column, op = self.filter_fields[name]
+            query = query.where(_OPERATORS[op](getattr(self._model, column), value))
+        return query
+
+    # Keyset seek: WHERE (key, id) > (...) instead of scanning skipped rows
+    def _seek(self, query: Select, after: list[Any], sort: str) -> Select:
+        columns, descending = self._sort_columns(sort)
+        if len(after) != len(columns):
+            raise BadRequestException("Invalid cursor")
+        compare = operator.lt if descending else operator.gt
+        bounds = [self._seek_bound(value) for value in after]
+        if len(columns) == 1:
+            return query.where(compare(columns[0], bounds[0]))
+        return query.where(compare(tuple_(*columns), tuple_(*bounds)))
+
+    # SQLite keeps timestamps as text: server defaults (CURRENT_TIMESTAMP) as
+    # 'YYYY-MM-DD HH:MM:SS', while datetime binds render with microseconds and
+    # would sort after every row of the same second. datetime() brings the
+    # bound to the stored format; the column stays bare so its index is used
+    def _seek_bound(self, value: Any) -> Any:
+        if (
+            isinstance(value, datetime)
+            and self._reader.get_bind().dialect.name == "sqlite"
+        ):
+            return func.datetime(value)
+        return value
+
+    async def count(self, filters: dict[str, Any] | None = None) -> int:
+        query = self._filter(select(func.count(self._model.id)), filters)
+        result = await self._reader.execute(query)
         return result.scalar_one()
 
+    # Total for list responses according to the configured count strategy;
+    # filtered totals are always exact since only the unfiltered count is cached
+    async def total(self, filters: dict[str, Any] | None = None) -> int | None:
+        if self._count_strategy == "none":
+            return None
+        if self._count_strategy == "exact" or any(
+            value is not None for value in (filters or {}).values()
+        ):
+            return await self.count(filters)
+        key = self._model.__tablename__
+        cached = _count_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        total = await self.count()
+        _count_cache[key] = (time.monotonic() + self._count_cache_ttl, total)
+        return total
+
+    # Queues change events on the session; they are published after commit
+    # Runs `callback` once this unit of work commits (dropped on rollback); an
+    # awaitable it returns is scheduled on the running loop
+    def on_commit(self, callback: Callable[[], Any]) -> None:
+        self._session.info.setdefault("on_commit", []).append(callback)
+
+    def _record_changes(self, action: str, entity_ids: Iterable[int]) -> None:
+        changes = self._session.info.setdefault("changes", [])
+        table = self._model.__tablename__
+        changes.extend((table, action, entity_id) for entity_id in entity_ids)
+
+    # Keeps a cached count approximately current between refreshes
+    def _adjust_cached_count(self, delta: int) -> None:
+        key = self._model.__tablename__
+        cached = _count_cache.get(key)
+        if cached:
+            _count_cache[key] = (cached[0], max(cached[1] + delta, 0))
+
+    # Writes are single round trips (... RETURNING) where the dialect allows it
     async def create(self, data: dict) -> T:
-        entity = self._model(**data)
-        self._session.add(entity)
-        await self._session.flush()
-        await self._session.refresh(entity)
+        self._mark_written()
+        if self._supports("insert_returning"):
+            entity = await self._session.scalar(
+                insert(self._model).values(**data).returning(self._model)
+            )
+        else:
+            entity = self._model(**data)
+            self._session.add(entity)
+            await self._session.flush()
+            await self._session.refresh(entity)
+        self._adjust_cached_count(1)
+        self._record_changes("created", [entity.id])
         return entity
 
-    async def update(self, entity_id: int, data: dict) -> T | None:
-        entity = await self.get_by_id(entity_id)
-        if not entity:
+    # With expected_version the write only applies if the row still has that
+    # version (optimistic locking in the same statement); None otherwise
+    async def update(
+        self, entity_id: int, data: dict, expected_version: int | None = None
+    ) -> T | None:
+        self._mark_written()
+        values = {key: value for key, value in data.items() if value is not None}
+        if not values:
+            entity = await self.get_by_id(entity_id)
+            if entity is None or expected_version in (None, entity.version):
+                return entity
             return None
-        for key, value in data.items():
-            if value is not None:
-                setattr(entity, key, value)
-        await self._session.flush()
-        await self._session.refresh(entity)
+        if not self._supports("update_returning"):
+            return await self._update_fallback(entity_id, values, expected_version)
+        result = await self._session.scalars(
+            update(self._model)
+            .where(self._versioned(entity_id, expected_version))
+            .values(**values, version=self._model.version + 1)
+            .returning(self._model)
+            .execution_options(populate_existing=True)
+        )
+        entity = result.one_or_none()
+        if entity is not None:
+            self._record_changes("updated", [entity_id])
         return entity
 
-    async def delete(self, entity_id: int) -> bool:
-        entity = await self.get_by_id(entity_id)
-        if not entity:
+    async def delete(self, entity_id: int, expected_version: int | None = None) -> bool:
+        self._mark_written()
+        if not self._supports("delete_returning"):
+            return await self._delete_fallback(entity_id, expected_version)
+        deleted = await self._session.scalar(
+            delete(self._model)
+            .where(self._versioned(entity_id, expected_version))
+            .returning(self._model.id)
+        )
+        if deleted is None:
             return False
-        await self._session.delete(entity)
-        await self._session.flush()
+        self._adjust_cached_count(-1)
+        self._record_changes("deleted", [entity_id])
         return True
+
+    def _supports(self, capability: str) -> bool:
+        return getattr(self._session.get_bind().dialect, capability, False)
+
+    def _versioned(
+        self, entity_id: int, expected_version: int | None
+    ) -> ColumnElement[bool]:
+        condition = self._model.id == entity_id
+        if expected_version is not None:
+            condition = and_(condition, self._model.version == expected_version)
+        return condition
+
+    # Without RETURNING: a conditional UPDATE/DELETE by rowcount, then a reload
+    async def _update_fallback(
+        self, entity_id: int, values: dict, expected_version: int | None
+    ) -> T | None:
+        result = await self._session.execute(
+            update(self._model)
+            .where(self._versioned(entity_id, expected_version))
+            .values(**values, version=self._model.version + 1)
+        )
+        if result.rowcount == 0:
+            return None
+        entity = await self._session.get(self._model, entity_id, populate_existing=True)
+        self._record_changes("updated", [entity_id])
+        return entity
+
+    async def _delete_fallback(
+        self, entity_id: int, expected_version: int | None
+    ) -> bool:
+        result = await self._session.execute(
+            delete(self._model).where(self._versioned(entity_id, expected_version))
+        )
+        if result.rowcount == 0:
+            return False
+        self._adjust_cached_count(-1)
+        self._record_changes("deleted", [entity_id])
+        return True
+
+    # Multi-row INSERT ... RETURNING; entities come back in the order of `rows`
+    # (callers such as WriteCoalescer match them up by position)
+    async def create_many(self, rows: list[dict]) -> list[T]:
+        if not rows:
+            return []
+        self._mark_written()
+        if self._supports("insert_executemany_returning"):
+            result = await self._session.scalars(
+                insert(self._model).returning(
+                    self._model, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+            entities = list(result.all())
+        else:
+            entities = [self._model(**row) for row in rows]
+            self._session.add_all(entities)
+            await self._session.flush()
+            for entity in entities:
+                await self._session.refresh(entity)
+        self._adjust_cached_count(len(entities))
+        self._record_changes("created", [entity.id for entity in entities])
+        return entities
+
+    # Batched UPDATE by primary key; ids that do not exist are skipped
+    async def update_many(self, changes: dict[int, dict]) -> list[T]:
+        if not changes:
+            return []
+        self._mark_written()
+        existing = await self._session.scalars(
+            select(self._model.id).where(self._model.id.in_(changes))
+        )
+        ids = list(existing.all())
+        params = []
+        for entity_id in ids:
+            values = {k: v for k, v in changes[entity_id].items() if v is not None}
+            if values:
+                params.append({"id": entity_id, **values})
+        if params:
+            await self._session.execute(
+                update(self._model).values(version=self._model.version + 1), params
+            )
+            self._record_changes("updated", [row["id"] for row in params])
+        result = await self._session.scalars(
+            select(self._model)
+            .where(self._model.id.in_(ids))
+            .order_by(self._model.id)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.all())
+
+    # Single DELETE ... WHERE id IN (...); returns the ids actually removed
+    async def delete_many(self, entity_ids: list[int]) -> list[int]:
+        if not entity_ids:
+            return []
+        self._mark_written()
+        if self._supports("delete_returning"):
+            result = await self._session.scalars(
+                delete(self._model)
+                .where(self._model.id.in_(entity_ids))
+                .returning(self._model.id)
+            )
+            deleted = sorted(result.all())
+        else:
+            existing = await self._session.scalars(
+                select(self._model.id).where(self._model.id.in_(entity_ids))
+            )
+            deleted = sorted(existing.all())
+            await self._session.execute(
+                delete(self._model).where(self._model.id.in_(deleted))
+            )
+        self._adjust_cached_count(-len(deleted))
+        self._record_changes("deleted", deleted)
+        return deleted
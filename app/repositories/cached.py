@@ -0,0 +1,167 @@
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import inspect
+
+from app.core.cache import ICacheBackend
+from app.db.base import Base
+from app.repositories.interfaces import IRepository
+
+T = TypeVar("T", bound=Base)
+
+
+# Detached copy of an entity, safe to share across sessions and requests
+def snapshot(entity: T) -> T:
+    mapper = inspect(type(entity))
+    return type(entity)(
+        **{attr.key: getattr(entity, attr.key) for attr in mapper.column_attrs}
+    )
+
+
+# Decorator: read-through cache for get_by_id, invalidated on writes
+class CachedRepository(Generic[T]):
+    def __init__(
+        self, repository: IRepository[T], cache: ICacheBackend, namespace: str
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+        self._namespace = namespace
+
+    # Entity-specific queries (e.g. search) pass straight through, uncached
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    def _key(self, entity_id: int) -> str:
+        return f"{self._namespace}:{entity_id}"
+
+    async def _delete(self, keys: list[str]) -> None:
+        for key in keys:
+            await self._cache.delete(key)
+
+    # Dropped right away and again once the write commits: a concurrent read
+    # in between would otherwise re-cache the old committed row until the TTL
+    async def _invalidate(self, entity_ids: Iterable[int]) -> None:
+        keys = [self._key(entity_id) for entity_id in entity_ids]
+        await self._delete(keys)
+        self._repository.on_commit(lambda: self._delete(keys))
+
+    def on_commit(self, callback: Callable[[], Any]) -> None:
+        self._repository.on_commit(callback)
+
+    async def get_by_id(self, entity_id: int) -> T | None:
+        cached = await self._cache.get(self._key(entity_id))
+        if cached is not None:
+            return snapshot(cached)
+        entity = await self._repository.get_by_id(entity_id)
+        if entity is not None:
+            await self._cache.set(self._key(entity_id), snapshot(entity))
+        return entity
+
+    async def get_many(self, entity_ids: Sequence[int]) -> list[T]:
+        unique = list(dict.fromkeys(entity_ids))
+        found: dict[int, T] = {}
+        for entity_id in unique:
+            cached = await self._cache.get(self._key(entity_id))
+            if cached is not None:
+                found[entity_id] = snapshot(cached)
+        missing = [entity_id for entity_id in unique if entity_id not in found]
+        for entity in await self._repository.get_many(missing):
+            await self._cache.set(self._key(entity.id), snapshot(entity))
+            found[entity.id] = entity
+        return sorted(found.values(), key=lambda entity: entity.id)
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[T]:
+        return await self._repository.get_all(skip, limit, after, filters, sort)
+
+    async def get_version(
+        self, entity_id: int, primary: bool = False
+    ) -> tuple[int, datetime] | None:
+        return await self._repository.get_version(entity_id, primary)
+
+    async def get_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[tuple[int, int, datetime]]:
+        return await self._repository.get_versions(skip, limit, after, filters, sort)
+
+    async def get_fields(
+        self, entity_id: int, fields: Sequence[str]
+    ) -> dict[str, Any] | None:
+        return await self._repository.get_fields(entity_id, fields)
+
+    async def get_all_fields(
+        self,
+        fields: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[dict[str, Any]]:
+        return await self._repository.get_all_fields(
+            fields, skip, limit, after, filters, sort
+        )
+
+    async def get_all_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[dict[str, Any]]:
+        return await self._repository.get_all_rows(skip, limit, after, filters, sort)
+
+    def stream(self, chunk_size: int = 1000) -> AsyncIterator[list[T]]:
+        return self._repository.stream(chunk_size)
+
+    def cursor_values(
+        self, entity: T | Mapping[str, Any], sort: str = "id"
+    ) -> list[Any]:
+        return self._repository.cursor_values(entity, sort)
+
+    async def count(self, filters: dict[str, Any] | None = None) -> int:
+        return await self._repository.count(filters)
+
+    async def total(self, filters: dict[str, Any] | None = None) -> int | None:
+        return await self._repository.total(filters)
+
+    async def create(self, data: dict) -> T:
+        return await self._repository.create(data)
+
+    async def update(
+        self, entity_id: int, data: dict, expected_version: int | None = None
+    ) -> T | None:
+        entity = await self._repository.update(entity_id, data, expected_version)
+        await self._invalidate([entity_id])
+        return entity
+
+    async def delete(self, entity_id: int, expected_version: int | None = None) -> bool:
+        deleted = await self._repository.delete(entity_id, expected_version)
+        await self._invalidate([entity_id])
+        return deleted
+
+    async def create_many(self, rows: list[dict]) -> list[T]:
+        return await self._repository.create_many(rows)
+
+    async def update_many(self, changes: dict[int, dict]) -> list[T]:
+        entities = await self._repository.update_many(changes)
+        await self._invalidate(changes)
+        return entities
+
+    async def delete_many(self, entity_ids: list[int]) -> list[int]:
+        deleted = await self._repository.delete_many(entity_ids)
+        await self._invalidate(deleted)
+        return deleted
@@ -0,0 +1,95 @@
+import asyncio
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.metrics import COALESCED_BATCH_SIZE
+from app.db.base import Base
+from app.repositories.interfaces import IRepository
+
+T = TypeVar("T", bound=Base)
+
+
+# Group commit for single-row creates: rows submitted within `window` seconds
+# (or until `max_batch` are waiting) are inserted and committed in one
+# transaction on a session of its own. A failing batch is retried row by row,
+# each in its own transaction, so every caller gets its own entity or error.
+class WriteCoalescer(Generic[T]):
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        repository_factory: Callable[[AsyncSession], IRepository[T]],
+        name: str,
+        max_batch: int = 64,
+        window: float = 0.002,
+    ) -> None:
+        self._session_factory = session_factory
+        self._repository_factory = repository_factory
+        self._name = name
+        self._max_batch = max_batch
+        self._window = window
+        self._pending: list[tuple[dict, asyncio.Future[T]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+        # SQLite has a single writer: batches commit one after another
+        self._write_lock = asyncio.Lock()
+
+    # The row is committed even if the caller is cancelled while waiting
+    async def create(self, data: dict) -> T:
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._pending.append((data, future))
+        if len(self._pending) >= self._max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._window, self._dispatch
+            )
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future[T]]]) -> None:
+        async with self._write_lock:
+            COALESCED_BATCH_SIZE.observe((self._name,), len(batch))
+            try:
+                async with self._session_factory() as session:
+                    repository = self._repository_factory(session)
+                    entities = await repository.create_many([d for d, _ in batch])
+                    await session.commit()
+            except Exception:
+                await self._flush_one_by_one(batch)
+                return
+            # create_many returns entities in the order of its rows
+            for (_, future), entity in zip(batch, entities, strict=True):
+                if not future.done():
+                    future.set_result(entity)
+
+    async def _flush_one_by_one(
+        self, batch: list[tuple[dict, asyncio.Future[T]]]
+    ) -> None:
+        for data, future in batch:
+            try:
+                async with self._session_factory() as session:
+                    entity = await self._repository_factory(session).create(data)
+                    await session.commit()
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(entity)
+
+    # Flushes whatever is still waiting (called on shutdown)
+    async def drain(self) -> None:
+        self._dispatch()
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
@@ -0,0 +1,31 @@
+import functools
+import inspect
+import time
+from typing import Any
+
+from app.core.metrics import REPOSITORY_SECONDS
+
+
+# Decorator: times every awaited repository method into a per-method histogram
+class InstrumentedRepository:
+    def __init__(self, repository: Any, name: str) -> None:
+        self._repository = repository
+        self._name = name
+
+    # Wrappers are built on first access and memoized on the instance
+    def __getattr__(self, method: str) -> Any:
+        target = getattr(self._repository, method)
+        if not inspect.iscoroutinefunction(target):
+            return target
+        labels = (self._name, method)
+
+        @functools.wraps(target)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await target(*args, **kwargs)
+            finally:
+                REPOSITORY_SECONDS.observe(labels, time.perf_counter() - started)
+
+        setattr(self, method, timed)
+        return timed
@@ -1,4 +1,6 @@
-from typing import Protocol, TypeVar, runtime_checkable
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from datetime import datetime
+from typing import Any, Protocol, TypeVar, runtime_checkable
 
 T = TypeVar("T")
 
@@ -6,20 +8,82 @@ T = TypeVar("T")
 # ISP: Interface segregada para operações de leitura
 @runtime_checkable
 class IReadRepository(Protocol[T]):
+    @property
+    def has_writes(self) -> bool: ...
     async def get_by_id(self, entity_id: int) -> T | None: ...
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[T]: ...
-    async def count(self) -> int: ...
+    async def get_many(self, entity_ids: Sequence[int]) -> list[T]: ...
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[T]: ...
+    async def get_version(
+        self, entity_id: int, primary: bool = False
+    ) -> tuple[int, datetime] | None: ...
+    async def get_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[tuple[int, int, datetime]]: ...
+    async def get_fields(
+        self, entity_id: int, fields: Sequence[str]
+    ) -> dict[str, Any] | None: ...
+    async def get_all_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[dict[str, Any]]: ...
+    async def get_all_fields(
+        self,
+        fields: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[dict[str, Any]]: ...
+    def stream(self, chunk_size: int = 1000) -> AsyncIterator[list[T]]: ...
+    def cursor_values(
+        self, entity: T | Mapping[str, Any], sort: str = "id"
+    ) -> list[Any]: ...
+    async def count(self, filters: dict[str, Any] | None = None) -> int: ...
+    async def total(self, filters: dict[str, Any] | None = None) -> int | None: ...
 
 
 # ISP: Interface segregada para operações de escrita
 @runtime_checkable
 class IWriteRepository(Protocol[T]):
     async def create(self, data: dict) -> T: ...
-    async def update(self, entity_id: int, data: dict) -> T | None: ...
-    async def delete(self, entity_id: int) -> bool: ...
+    async def update(
+        self, entity_id: int, data: dict, expected_version: int | None = None
+    ) -> T | None: ...
+    async def delete(
+        self, entity_id: int, expected_version: int | None = None
+    ) -> bool: ...
+    async def create_many(self, rows: list[dict]) -> list[T]: ...
+    async def update_many(self, changes: dict[int, dict]) -> list[T]: ...
+    async def delete_many(self, entity_ids: list[int]) -> list[int]: ...
+    def on_commit(self, callback: Callable[[], Any]) -> None: ...
 
 
 # Interface completa que combina leitura e escrita
 @runtime_checkable
 class IRepository(IReadRepository[T], IWriteRepository[T], Protocol[T]):
     pass
+
+
+# ISP: Interface segregada para busca textual ranqueada
+@runtime_checkable
+class ISearchRepository(Protocol[T]):
+    async def search(
+        self, query: str, limit: int = 100, after: list[Any] | None = None
+    ) -> list[tuple[T, float]]: ...
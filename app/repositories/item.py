@@ -1,10 +1,117 @@
+import math
+import re
+from typing import Any
+
+from sqlalchemy import column, func, literal_column, select, table, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.item import Item
+from app.core.exceptions import BadRequestException
+from app.models.item import ITEM_STATS_REBUILD, Item, item_stats
 from app.repositories.base import BaseRepository
 
+_WORD = re.compile(r"\w+")
+_items_fts = table("items_fts", column("rowid"), column("rank"))
+
+
+# FTS5 query from free text: every word must match, the last one as a prefix
+def _fts5_query(query: str) -> str:
+    words = _WORD.findall(query)
+    return " ".join(f'"{word}"' for word in words) + "*" if words else ""
+
 
 # Item-specific repository - add custom queries here
 class ItemRepository(BaseRepository[Item]):
-    def __init__(self, session: AsyncSession) -> None:
-        super().__init__(session, Item)
+    # Each filter/sort combination is backed by an index declared on Item
+    filter_fields = {
+        "is_active": ("is_active", "eq"),
+        "min_price": ("price", "ge"),
+        "max_price": ("price", "le"),
+        "name_prefix": ("name", "prefix"),
+    }
+    sort_fields = ("id", "name", "price", "created_at")
+
+    def __init__(self, session: AsyncSession, **options: Any) -> None:
+        super().__init__(session, Item, **options)
+
+    # Ranked full-text search (FTS5 on SQLite, tsvector on Postgres); lower rank
+    # is a better match, and `after` is the (rank, id) of the previous page's last hit
+    async def search(
+        self, query: str, limit: int = 100, after: list[Any] | None = None
+    ) -> list[tuple[Item, float]]:
+        if after is not None and len(after) != 2:
+            raise BadRequestException("Invalid cursor")
+        if self._reader.get_bind().dialect.name == "postgresql":
+            tsquery = func.websearch_to_tsquery("simple", query)
+            vector = literal_column("items.search_vector")
+            rank = -func.ts_rank_cd(vector, tsquery)
+            match = vector.op("@@")(tsquery)
+            stmt = select(Item, rank.label("rank")).where(match)
+        else:
+            terms = _fts5_query(query)
+            if not terms:
+                return []
+            rank = _items_fts.c.rank
+            stmt = (
+                select(Item, rank.label("rank"))
+                .join(_items_fts, _items_fts.c.rowid == Item.id)
+                .where(text("items_fts MATCH :terms").bindparams(terms=terms))
+            )
+        if after is not None:
+            stmt = stmt.where(tuple_(rank, Item.id) > tuple_(*after))
+        result = await self._reader.execute(stmt.order_by(rank, Item.id).limit(limit))
+        return [(item, score) for item, score in result.all()]
+
+    # Summary rows per is_active: count and price sum from item_stats, min/max
+    # from index seeks on (is_active, price); no scan of items
+    async def stats(self) -> list[dict[str, Any]]:
+        def price_bound(aggregate: Any) -> Any:
+            return (
+                select(aggregate(Item.price))
+                .where(Item.is_active == item_stats.c.is_active)
+                .scalar_subquery()
+            )
+
+        query = select(
+            item_stats.c.is_active,
+            item_stats.c.item_count,
+            item_stats.c.price_sum,
+            price_bound(func.min).label("min_price"),
+            price_bound(func.max).label("max_price"),
+        ).order_by(item_stats.c.is_active.desc())
+        return await self._fetch_dicts(query)
+
+    # Recomputes item_stats from items in one transaction (full scan)
+    async def rebuild_stats(self) -> None:
+        self._mark_written()
+        if self._session.get_bind().dialect.name == "postgresql":
+            await self._session.execute(text("LOCK TABLE items IN SHARE MODE"))
+        for statement in ITEM_STATS_REBUILD:
+            await self._session.execute(text(statement))
+
+    # Differences between item_stats and a full recount, one line per mismatch
+    async def check_stats(self) -> list[str]:
+        stored = {
+            row["is_active"]: (row["item_count"], row["price_sum"])
+            for row in await self.stats()
+        }
+        actual = select(Item.is_active, func.count(), func.sum(Item.price)).group_by(
+            Item.is_active
+        )
+        counted = {
+            is_active: (count, total)
+            for is_active, count, total in await self._reader.execute(actual)
+        }
+        problems = []
+        for is_active in (True, False):
+            expected = counted.get(is_active, (0, 0.0))
+            found = stored.get(is_active)
+            if found is None:
+                problems.append(f"is_active={is_active}: summary row missing")
+            elif found[0] != expected[0] or not math.isclose(
+                found[1], expected[1], rel_tol=1e-9, abs_tol=1e-6
+            ):
+                problems.append(
+                    f"is_active={is_active}: stored count={found[0]} "
+                    f"sum={found[1]}, actual count={expected[0]} sum={expected[1]}"
+                )
+        return problems
@@ -8,9 +8,47 @@ T = TypeVar("T")
 # Standard paginated response wrapper
 class PaginatedResponse(BaseModel, Generic[T]):
     items: list[T]
-    total: int
+    total: int | None
     skip: int
     limit: int
+    next_cursor: str | None = None
+
+
+# Per-record failure in a bulk request; index refers to the request body list
+class BulkError(BaseModel):
+    index: int
+    id: int | None = None
+    detail: str
+
+
+# Result of a bulk create/update: processed records plus per-record errors
+class BulkResponse(BaseModel, Generic[T]):
+    items: list[T]
+    errors: list[BulkError]
+
+
+# Result of a bulk delete
+class BulkDeleteResponse(BaseModel):
+    deleted: list[int]
+    errors: list[BulkError]
+
+
+# Request body for a bulk delete
+class BulkDeleteRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1)
+
+
+# Rejected record of an import; line is 1-based within the uploaded file
+class ImportRecordError(BaseModel):
+    line: int
+    detail: str
+
+
+# Result of a streaming import (errors are capped, rejected is the full count)
+class ImportSummary(BaseModel):
+    inserted: int
+    rejected: int
+    errors: list[ImportRecordError]
 
 
 # Reusable pagination query parameters
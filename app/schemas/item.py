@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -19,6 +20,17 @@ class ItemUpdate(BaseModel):
     is_active: bool | None = None
 
 
+# Schema for one entry of a bulk update (ItemUpdate plus the target id)
+class ItemBulkUpdate(ItemUpdate):
+    id: int
+
+
+# Allowed list orderings; "-" means descending
+ItemSort = Literal[
+    "id", "-id", "name", "-name", "price", "-price", "created_at", "-created_at"
+]
+
+
 # Schema for item responses
 class ItemResponse(BaseModel):
     id: int
@@ -30,3 +42,30 @@ class ItemResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+# Sparse fieldset view of an item (?fields=); fields not requested are unset
+# and left out of the JSON
+class ItemFieldsResponse(BaseModel):
+    id: int | None = None
+    name: str | None = None
+    description: str | None = None
+    price: float | None = None
+    is_active: bool | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+# Price aggregates over a set of items; avg/min/max are null when it is empty
+class ItemPriceStats(BaseModel):
+    count: int
+    total_price: float
+    avg_price: float | None
+    min_price: float | None
+    max_price: float | None
+
+
+# Schema for GET /items/stats: all items plus the active/inactive breakdown
+class ItemStatsResponse(ItemPriceStats):
+    active: ItemPriceStats
+    inactive: ItemPriceStats
@@ -1,32 +1,200 @@
-from typing import Generic, TypeVar
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Mapping,
+    Sequence,
+)
+from datetime import datetime
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
 
-from app.repositories.base import BaseRepository
+from app.core.singleflight import SingleFlight
+from app.repositories.cached import snapshot
+from app.repositories.coalescing import WriteCoalescer
+from app.repositories.interfaces import IRepository
 
 T = TypeVar("T")
 CreateSchema = TypeVar("CreateSchema", bound=BaseModel)
 UpdateSchema = TypeVar("UpdateSchema", bound=BaseModel)
+R = TypeVar("R")
+
+
+# Identical arguments normalise to the same flight key (e.g. no filters and {})
+def _page_key(
+    skip: int,
+    limit: int,
+    after: Sequence[Any] | None,
+    filters: dict[str, Any] | None,
+    sort: str,
+) -> Hashable:
+    filters_key = tuple(sorted((filters or {}).items()))
+    return skip, limit, tuple(after or ()), filters_key, sort
+
+
+# Private copies for callers that joined another request's flight: entities are
+# detached from the leader's session, rows can be mutated freely
+def _share_entity(entity: Any) -> Any:
+    return None if entity is None else snapshot(entity)
+
+
+def _share_entities(entities: list[Any]) -> list[Any]:
+    return [snapshot(entity) for entity in entities]
+
+
+def _share_rows(rows: Sequence[dict[str, Any]]) -> Sequence[dict[str, Any]]:
+    return [dict(row) for row in rows]
 
 
 # Generic service with full CRUD - extend for specific business logic
 class BaseService(Generic[T, CreateSchema, UpdateSchema]):
-    def __init__(self, repository: BaseRepository[T]) -> None:
+    def __init__(
+        self,
+        repository: IRepository[T],
+        coalescer: WriteCoalescer | None = None,
+        reads: SingleFlight | None = None,
+    ) -> None:
         self._repository = repository
+        self._coalescer = coalescer
+        self._reads = reads
+
+    # Runs a read through the shared singleflight, unless this unit of work
+    # already wrote and must see its own changes
+    async def _read(
+        self,
+        method: str,
+        args: Hashable,
+        call: Callable[[], Awaitable[R]],
+        share: Callable[[R], R],
+    ) -> R:
+        if self._reads is None or self._repository.has_writes:
+            return await call()
+        return await self._reads.do(method, args, call, share)
 
     async def get(self, entity_id: int) -> T | None:
-        return await self._repository.get_by_id(entity_id)
+        return await self._read(
+            "get",
+            entity_id,
+            lambda: self._repository.get_by_id(entity_id),
+            _share_entity,
+        )
+
+    async def get_many(self, entity_ids: Sequence[int]) -> Sequence[T]:
+        return await self._repository.get_many(entity_ids)
+
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[T]:
+        return await self._read(
+            "list",
+            _page_key(skip, limit, after, filters, sort),
+            lambda: self._repository.get_all(skip, limit, after, filters, sort),
+            _share_entities,
+        )
+
+    async def version(
+        self, entity_id: int, primary: bool = False
+    ) -> tuple[int, datetime] | None:
+        return await self._repository.get_version(entity_id, primary)
 
-    async def list(self, skip: int = 0, limit: int = 100) -> list[T]:
-        return await self._repository.get_all(skip, limit)
+    async def page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Sequence[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> Sequence[tuple[int, int, datetime]]:
+        return await self._repository.get_versions(skip, limit, after, filters, sort)
 
+    async def get_fields(
+        self, entity_id: int, fields: Sequence[str]
+    ) -> dict[str, Any] | None:
+        return await self._repository.get_fields(entity_id, fields)
+
+    # Read-only page as plain dicts, for endpoints that only serialize rows
+    async def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Sequence[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> Sequence[dict[str, Any]]:
+        return await self._read(
+            "list_rows",
+            _page_key(skip, limit, after, filters, sort),
+            lambda: self._repository.get_all_rows(skip, limit, after, filters, sort),
+            _share_rows,
+        )
+
+    async def list_fields(
+        self,
+        fields: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        after: Sequence[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> Sequence[dict[str, Any]]:
+        return await self._repository.get_all_fields(
+            fields, skip, limit, after, filters, sort
+        )
+
+    async def total(self, filters: dict[str, Any] | None = None) -> int | None:
+        return await self._read(
+            "total",
+            tuple(sorted((filters or {}).items())),
+            lambda: self._repository.total(filters),
+            lambda count: count,
+        )
+
+    def stream(self, chunk_size: int = 1000) -> AsyncIterator[Sequence[T]]:
+        return self._repository.stream(chunk_size)
+
+    # Cursor values for the page after `items`, or None when it is the last page
+    def next_cursor(
+        self, items: Sequence[T | Mapping[str, Any]], limit: int, sort: str = "id"
+    ) -> Sequence[Any] | None:
+        if len(items) < limit:
+            return None
+        return self._repository.cursor_values(items[-1], sort)
+
+    # With a coalescer the row is committed in a shared batch transaction,
+    # independently of the caller's unit of work
     async def create(self, data: CreateSchema) -> T:
+        if self._coalescer is not None:
+            return await self._coalescer.create(data.model_dump())
         return await self._repository.create(data.model_dump())
 
-    async def update(self, entity_id: int, data: UpdateSchema) -> T | None:
+    # expected_version: apply only if the row still has that version
+    async def update(
+        self,
+        entity_id: int,
+        data: UpdateSchema,
+        expected_version: int | None = None,
+    ) -> T | None:
         return await self._repository.update(
-            entity_id, data.model_dump(exclude_unset=True)
+            entity_id, data.model_dump(exclude_unset=True), expected_version
+        )
+
+    async def delete(self, entity_id: int, expected_version: int | None = None) -> bool:
+        return await self._repository.delete(entity_id, expected_version)
+
+    async def create_many(self, data: Sequence[CreateSchema]) -> Sequence[T]:
+        return await self._repository.create_many([d.model_dump() for d in data])
+
+    async def update_many(self, data: dict[int, UpdateSchema]) -> Sequence[T]:
+        return await self._repository.update_many(
+            {k: v.model_dump(exclude_unset=True) for k, v in data.items()}
         )
 
-    async def delete(self, entity_id: int) -> bool:
-        return await self._repository.delete(entity_id)
+    async def delete_many(self, entity_ids: Sequence[int]) -> Sequence[int]:
+        return await self._repository.delete_many(list(entity_ids))
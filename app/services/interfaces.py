@@ -1,4 +1,6 @@
-from typing import Protocol, TypeVar, runtime_checkable
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import datetime
+from typing import Any, Protocol, TypeVar, runtime_checkable
 
 T = TypeVar("T")
 CreateSchema = TypeVar("CreateSchema")
@@ -9,15 +11,66 @@ UpdateSchema = TypeVar("UpdateSchema")
 @runtime_checkable
 class IReadService(Protocol[T]):
     async def get(self, entity_id: int) -> T | None: ...
-    async def list(self, skip: int = 0, limit: int = 100) -> list[T]: ...
+    async def get_many(self, entity_ids: Sequence[int]) -> Sequence[T]: ...
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: list[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> list[T]: ...
+    async def version(
+        self, entity_id: int, primary: bool = False
+    ) -> tuple[int, datetime] | None: ...
+    async def page_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Sequence[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> Sequence[tuple[int, int, datetime]]: ...
+    async def get_fields(
+        self, entity_id: int, fields: Sequence[str]
+    ) -> dict[str, Any] | None: ...
+    async def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Sequence[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> Sequence[dict[str, Any]]: ...
+    async def list_fields(
+        self,
+        fields: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        after: Sequence[Any] | None = None,
+        filters: dict[str, Any] | None = None,
+        sort: str = "id",
+    ) -> Sequence[dict[str, Any]]: ...
+    async def total(self, filters: dict[str, Any] | None = None) -> int | None: ...
+    def stream(self, chunk_size: int = 1000) -> AsyncIterator[Sequence[T]]: ...
+    def next_cursor(
+        self, items: Sequence[T | Mapping[str, Any]], limit: int, sort: str = "id"
+    ) -> Sequence[Any] | None: ...
 
 
 # ISP: Interface segregada para escrita
 @runtime_checkable
 class IWriteService(Protocol[T]):
     async def create(self, data: object) -> T: ...
-    async def update(self, entity_id: int, data: object) -> T | None: ...
-    async def delete(self, entity_id: int) -> bool: ...
+    async def update(
+        self, entity_id: int, data: object, expected_version: int | None = None
+    ) -> T | None: ...
+    async def delete(
+        self, entity_id: int, expected_version: int | None = None
+    ) -> bool: ...
+    async def create_many(self, data: Sequence[object]) -> Sequence[T]: ...
+    async def update_many(self, data: dict[int, object]) -> Sequence[T]: ...
+    async def delete_many(self, entity_ids: Sequence[int]) -> Sequence[int]: ...
 
 
 # Interface completa que combina leitura e escrita
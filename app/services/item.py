@@ -1,10 +1,49 @@
+from typing import Any
+
+from app.core.singleflight import SingleFlight
 from app.models.item import Item
-from app.repositories.item import ItemRepository
+from app.repositories.coalescing import WriteCoalescer
+from app.repositories.interfaces import IRepository
 from app.schemas.item import ItemCreate, ItemUpdate
 from app.services.base import BaseService
 
 
 # Item-specific service - add custom business logic here
 class ItemService(BaseService[Item, ItemCreate, ItemUpdate]):
-    def __init__(self, repository: ItemRepository) -> None:
-        super().__init__(repository)
+    def __init__(
+        self,
+        repository: IRepository[Item],
+        coalescer: WriteCoalescer[Item] | None = None,
+        reads: SingleFlight | None = None,
+    ) -> None:
+        super().__init__(repository, coalescer, reads)
+
+    async def search(
+        self, query: str, limit: int = 100, after: list[Any] | None = None
+    ) -> list[tuple[Item, float]]:
+        return await self._repository.search(query, limit, after)
+
+    # Combines the per-is_active summary rows into overall and split figures
+    async def stats(self) -> dict[str, Any]:
+        groups = {row["is_active"]: row for row in await self._repository.stats()}
+
+        def summarize(rows: list[dict[str, Any]]) -> dict[str, Any]:
+            count = sum(row["item_count"] for row in rows)
+            total = sum(row["price_sum"] for row in rows)
+            mins = [row["min_price"] for row in rows if row["min_price"] is not None]
+            maxes = [row["max_price"] for row in rows if row["max_price"] is not None]
+            return {
+                "count": count,
+                "total_price": total,
+                "avg_price": total / count if count else None,
+                "min_price": min(mins, default=None),
+                "max_price": max(maxes, default=None),
+            }
+
+        active = [groups[True]] if True in groups else []
+        inactive = [groups[False]] if False in groups else []
+        return {
+            **summarize([*active, *inactive]),
+            "active": summarize(active),
+            "inactive": summarize(inactive),
+        }
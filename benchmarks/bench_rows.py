@@ -0,0 +1,86 @@
+"""Micro-benchmark: ORM entity page vs read-only row page, latency and memory.
+
+Both paths fetch and serialize one ``list_items`` page from a seeded SQLite
+file. Run with ``python -m benchmarks.bench_rows``.
+"""
+
+import asyncio
+import gc
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.serialization import dump_json, row_dicts
+from app.db.session import build_engine
+from app.models.item import Item
+from app.repositories.base import BaseRepository
+from app.schemas.base import PaginatedResponse
+from app.schemas.item import ItemResponse
+from benchmarks.crud import _seed
+
+SIZES = (100, 1000)
+REPEAT = 30
+SCHEMA = PaginatedResponse[ItemResponse]
+
+PagePath = Callable[[BaseRepository[Item], int], Awaitable[bytes]]
+
+
+def _page(rows: list, limit: int) -> bytes:
+    return dump_json(SCHEMA, {"items": rows, "total": None, "skip": 0, "limit": limit})
+
+
+async def orm_path(repository: BaseRepository[Item], limit: int) -> bytes:
+    return _page(row_dicts(await repository.get_all(limit=limit)), limit)
+
+
+async def row_path(repository: BaseRepository[Item], limit: int) -> bytes:
+    return _page(await repository.get_all_rows(limit=limit), limit)
+
+
+async def _run(engine: AsyncEngine, path: PagePath, limit: int) -> bytes:
+    async with AsyncSession(engine) as session:
+        return await path(BaseRepository(session, Item), limit)
+
+
+# Median wall time and peak traced allocation of one request-sized call
+async def _measure(
+    engine: AsyncEngine, path: PagePath, limit: int
+) -> tuple[float, int]:
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        await _run(engine, path, limit)
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    await _run(engine, path, limit)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        engine.sync_engine.echo = False
+        await _seed(engine, max(SIZES))
+        print(f"{'rows':>6} {'path':>5} {'median (ms)':>12} {'peak (KiB)':>11}")
+        for size in SIZES:
+            assert await _run(engine, orm_path, size) == await _run(
+                engine, row_path, size
+            )
+            for name, path in (("orm", orm_path), ("rows", row_path)):
+                median, peak = await _measure(engine, path, size)
+                print(
+                    f"{size:>6} {name:>5} {median * 1000:>12.2f} {peak / 1024:>11.0f}"
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""Micro-benchmark: per-row model_validate vs single-pass TypeAdapter dump.
+
+Run with ``python -m benchmarks.bench_serialization``.
+"""
+
+import timeit
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import dump_json, row_dicts
+from app.models.item import Item
+from app.schemas.base import PaginatedResponse
+from app.schemas.item import ItemResponse
+
+SIZES = (10, 100, 1000)
+SCHEMA = PaginatedResponse[ItemResponse]
+# What FastAPI does with a returned model: validate against the field, then dump
+_response_field = TypeAdapter(SCHEMA)
+
+
+def _rows(size: int) -> list[Item]:
+    now = datetime(2024, 1, 1)
+    return [
+        Item(
+            id=i,
+            name=f"Item {i}",
+            description="A reasonably sized description for the item",
+            price=i * 1.5,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(size)
+    ]
+
+
+def old_path(rows: list[Item]) -> bytes:
+    page = PaginatedResponse(
+        items=[ItemResponse.model_validate(row) for row in rows],
+        total=len(rows),
+        skip=0,
+        limit=len(rows),
+    )
+    return _response_field.dump_json(_response_field.validate_python(page))
+
+
+def new_path(rows: list[Item]) -> bytes:
+    page = {"items": row_dicts(rows), "total": len(rows), "skip": 0, "limit": len(rows)}
+    return dump_json(SCHEMA, page)
+
+
+def main() -> None:
+    print(f"{'rows':>6} {'old (ms)':>10} {'new (ms)':>10} {'speedup':>8}")
+    for size in SIZES:
+        rows = _rows(size)
+        assert old_path(rows) == new_path(rows)
+        number = max(10, 10_000 // size)
+        old = min(timeit.repeat(lambda: old_path(rows), number=number, repeat=5))
+        new = min(timeit.repeat(lambda: new_path(rows), number=number, repeat=5))
+        old_ms, new_ms = old / number * 1000, new / number * 1000
+        print(f"{size:>6} {old_ms:>10.3f} {new_ms:>10.3f} {old_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Benchmark suite for the items CRUD hot paths.
+
+Seeds a temporary SQLite file, drives the ASGI app in-process through httpx's
+``ASGITransport`` (as ``tests/conftest.py`` does) and reports throughput and
+latency percentiles per operation as JSON::
+
+    python -m benchmarks.crud run --rows 100000 --concurrency 16 -o new.json
+    python -m benchmarks.crud compare base.json new.json --threshold 0.10
+
+``compare`` exits with status 1 when any operation regressed by more than the
+threshold (p95 latency up, or throughput down).
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import sqlalchemy
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.v1.dependencies import get_item_coalescer, get_item_reads
+from app.core.singleflight import SingleFlight
+from app.db.base import Base
+from app.db.session import build_engine, get_session
+from app.main import app
+from app.models.item import Item
+from app.repositories.coalescing import WriteCoalescer
+from app.repositories.item import ItemRepository
+
+BASE_URL = "/api/v1/items"
+SEED_BATCH = 10_000
+PAGE_SIZE = 50
+
+Request = Callable[[AsyncClient, random.Random], Awaitable[Response]]
+
+
+async def _seed(engine: AsyncEngine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for start in range(0, rows, SEED_BATCH):
+            batch = [
+                {
+                    "name": f"Item {i:07d}",
+                    "description": f"Seeded item number {i}",
+                    "price": round(1 + (i % 1000) * 0.37, 2),
+                    "is_active": i % 5 != 0,
+                }
+                for i in range(start, min(start + SEED_BATCH, rows))
+            ]
+            await conn.execute(insert(Item), batch)
+
+
+def _operations(rows: int, requests: int) -> dict[str, Request]:
+    deletable = random.Random(0).sample(range(1, rows + 1), min(requests, rows))
+
+    async def create(client: AsyncClient, rng: random.Random) -> Response:
+        payload = {"name": f"Bench {rng.random():.8f}", "price": 9.99}
+        return await client.post(f"{BASE_URL}/", json=payload)
+
+    async def get(client: AsyncClient, rng: random.Random) -> Response:
+        return await client.get(f"{BASE_URL}/{rng.randint(1, rows)}")
+
+    async def list_shallow(client: AsyncClient, rng: random.Random) -> Response:
+        return await client.get(f"{BASE_URL}/", params={"limit": PAGE_SIZE})
+
+    async def list_deep(client: AsyncClient, rng: random.Random) -> Response:
+        skip = max(rows - PAGE_SIZE - rng.randint(0, PAGE_SIZE), 0)
+        return await client.get(
+            f"{BASE_URL}/", params={"skip": skip, "limit": PAGE_SIZE}
+        )
+
+    async def update(client: AsyncClient, rng: random.Random) -> Response:
+        payload = {"price": round(rng.uniform(1, 100), 2)}
+        return await client.put(f"{BASE_URL}/{rng.randint(1, rows)}", json=payload)
+
+    async def delete(client: AsyncClient, rng: random.Random) -> Response:
+        return await client.delete(f"{BASE_URL}/{deletable.pop()}")
+
+    # Delete runs last so it never removes rows the other operations target
+    return {
+        "create": create,
+        "get": get,
+        "list_shallow": list_shallow,
+        "list_deep": list_deep,
+        "update": update,
+        "delete": delete,
+    }
+
+
+def _summarize(latencies: list[float], errors: int, wall: float) -> dict[str, Any]:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+async def _measure(
+    client: AsyncClient, request: Request, total: int, concurrency: int, seed: int
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker(rng: random.Random) -> None:
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await request(client, rng)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(random.Random(seed + n)) for n in range(concurrency)))
+    return _summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        engine.sync_engine.echo = False
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def override_get_session() -> AsyncGenerator[AsyncSession, None]:
+            async with session_factory() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+
+        seed_started = time.perf_counter()
+        await _seed(engine, args.rows)
+        seed_seconds = time.perf_counter() - seed_started
+
+        app.dependency_overrides[get_session] = override_get_session
+        if args.coalesce:
+            coalescer = WriteCoalescer(session_factory, ItemRepository, "bench")
+            app.dependency_overrides[get_item_coalescer] = lambda: coalescer
+        if args.share_reads:
+            reads = SingleFlight("bench")
+            app.dependency_overrides[get_item_reads] = lambda: reads
+        results: dict[str, Any] = {}
+        try:
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://bench") as ac:
+                operations = _operations(args.rows, args.requests)
+                for name, request in operations.items():
+                    if args.only and name not in args.only:
+                        continue
+                    if name != "delete":
+                        await _measure(ac, request, args.warmup, 1, args.seed)
+                    results[name] = await _measure(
+                        ac, request, args.requests, args.concurrency, args.seed
+                    )
+                    print(f"{name:>12}: {results[name]}", file=sys.stderr)
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "rows": args.rows,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "coalesce": args.coalesce,
+            "share_reads": args.share_reads,
+            "seed_seconds": round(seed_seconds, 3),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "results": results,
+    }
+
+
+# Relative change per metric; positive always means "worse"
+def compare(
+    base: dict[str, Any], new: dict[str, Any], threshold: float
+) -> tuple[list[str], bool]:
+    lines = [f"{'operation':>12} {'p95 base':>10} {'p95 new':>10} {'rps base':>10} "]
+    lines[0] += f"{'rps new':>10}  verdict"
+    regressed = False
+    for name, old in base["results"].items():
+        current = new["results"].get(name)
+        if current is None:
+            continue
+        slower = current["p95_ms"] / old["p95_ms"] - 1
+        fewer = 1 - current["throughput_rps"] / old["throughput_rps"]
+        if slower > threshold or fewer > threshold:
+            verdict, regressed = "REGRESSION", True
+        elif slower < -threshold and fewer < -threshold:
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        lines.append(
+            f"{name:>12} {old['p95_ms']:>10.3f} {current['p95_ms']:>10.3f} "
+            f"{old['throughput_rps']:>10.1f} {current['throughput_rps']:>10.1f}  "
+            f"{verdict} (p95 {slower:+.1%}, rps {-fewer:+.1%})"
+        )
+    return lines, regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.crud")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Seed a database and benchmark")
+    run_parser.add_argument("--rows", type=int, default=1000)
+    run_parser.add_argument("--requests", type=int, default=500)
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--only", nargs="*", help="Operations to run")
+    run_parser.add_argument(
+        "--coalesce", action="store_true", help="Group-commit concurrent creates"
+    )
+    run_parser.add_argument(
+        "--share-reads", action="store_true", help="Singleflight identical reads"
+    )
+    run_parser.add_argument("-o", "--output", type=Path, help="Write JSON here")
+
+    compare_parser = commands.add_parser("compare", help="Diff two JSON results")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("new", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        report = json.dumps(asyncio.run(run(args)), indent=2)
+        if args.output:
+            args.output.write_text(report + "\n")
+        else:
+            print(report)
+        return
+    base = json.loads(args.base.read_text())
+    new = json.loads(args.new.read_text())
+    lines, regressed = compare(base, new, args.threshold)
+    print("\n".join(lines))
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
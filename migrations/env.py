@@ -5,6 +5,7 @@ from alembic import context
 from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
+import app.models.item  # noqa: F401 - registers models on Base.metadata
 from app.config import settings
 from app.db.base import Base
 
@@ -18,16 +19,34 @@ if config.config_file_name is not None:
 # Target metadata for autogenerate
 target_metadata = Base.metadata
 
+# Database objects managed by raw-SQL migrations, invisible to the models
+UNMANAGED_PREFIXES = ("items_fts", "search_vector")
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    return not (
+        reflected and compare_to is None and name.startswith(UNMANAGED_PREFIXES)
+    )
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True)
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
 
 def do_run_migrations(connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -0,0 +1,31 @@
+"""add items list indexes
+
+Revision ID: 33c48e163b54
+Revises: a4dabee28176
+Create Date: 2026-10-18 09:30:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "33c48e163b54"
+down_revision: str | None = "a4dabee28176"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_items_name_id", "items", ["name", "id"])
+    op.create_index("ix_items_price_id", "items", ["price", "id"])
+    op.create_index("ix_items_created_at_id", "items", ["created_at", "id"])
+    op.create_index(
+        "ix_items_is_active_price_id", "items", ["is_active", "price", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_is_active_price_id", table_name="items")
+    op.drop_index("ix_items_created_at_id", table_name="items")
+    op.drop_index("ix_items_price_id", table_name="items")
+    op.drop_index("ix_items_name_id", table_name="items")
@@ -0,0 +1,66 @@
+"""add items full-text search
+
+Revision ID: 9d8ae1152175
+Revises: 33c48e163b54
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "9d8ae1152175"
+down_revision: str | None = "33c48e163b54"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE items_fts USING fts5("
+    "name, description, content='items', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER items_fts_au AFTER UPDATE OF name, description ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO items_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    # Index the rows that already exist
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS items_fts_au",
+    "DROP TRIGGER IF EXISTS items_fts_ad",
+    "DROP TRIGGER IF EXISTS items_fts_ai",
+    "DROP TABLE IF EXISTS items_fts",
+]
+# Postgres keeps the vector current through a generated column instead of triggers
+POSTGRES_UPGRADE = [
+    "ALTER TABLE items ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX ix_items_search_vector ON items USING GIN (search_vector)",
+]
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_items_search_vector",
+    "ALTER TABLE items DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(sqlite: list[str], postgres: list[str]) -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": sqlite, "postgresql": postgres}.get(dialect, [])
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _run(SQLITE_UPGRADE, POSTGRES_UPGRADE)
+
+
+def downgrade() -> None:
+    _run(SQLITE_DOWNGRADE, POSTGRES_DOWNGRADE)
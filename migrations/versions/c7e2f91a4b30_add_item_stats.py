@@ -0,0 +1,89 @@
+"""add item stats
+
+Revision ID: c7e2f91a4b30
+Revises: 9d8ae1152175
+Create Date: 2026-10-18 11:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c7e2f91a4b30"
+down_revision: str | None = "9d8ae1152175"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Seeds both summary rows and fills them from the rows that already exist
+BACKFILL = [
+    "INSERT INTO item_stats (is_active, item_count, price_sum) "
+    "VALUES (false, 0, 0), (true, 0, 0)",
+    "UPDATE item_stats SET "
+    "item_count = (SELECT COUNT(*) FROM items "
+    "WHERE items.is_active = item_stats.is_active), "
+    "price_sum = (SELECT COALESCE(SUM(price), 0) FROM items "
+    "WHERE items.is_active = item_stats.is_active)",
+]
+_ADD = (
+    "UPDATE item_stats SET item_count = item_count + 1, "
+    "price_sum = price_sum + new.price WHERE is_active = new.is_active; "
+)
+_SUBTRACT = (
+    "UPDATE item_stats SET item_count = item_count - 1, "
+    "price_sum = price_sum - old.price WHERE is_active = old.is_active; "
+)
+SQLITE_UPGRADE = [
+    f"CREATE TRIGGER item_stats_ai AFTER INSERT ON items BEGIN {_ADD}END",
+    f"CREATE TRIGGER item_stats_ad AFTER DELETE ON items BEGIN {_SUBTRACT}END",
+    "CREATE TRIGGER item_stats_au AFTER UPDATE OF price, is_active ON items "
+    f"BEGIN {_SUBTRACT}{_ADD}END",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS item_stats_au",
+    "DROP TRIGGER IF EXISTS item_stats_ad",
+    "DROP TRIGGER IF EXISTS item_stats_ai",
+]
+POSTGRES_UPGRADE = [
+    "LOCK TABLE items IN SHARE MODE",
+    "CREATE FUNCTION item_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$ "
+    "BEGIN "
+    f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_SUBTRACT}END IF; "
+    f"IF TG_OP IN ('INSERT', 'UPDATE') THEN {_ADD}END IF; "
+    "RETURN NULL; "
+    "END $$",
+    "CREATE TRIGGER item_stats_maintain "
+    "AFTER INSERT OR DELETE OR UPDATE OF price, is_active ON items "
+    "FOR EACH ROW EXECUTE FUNCTION item_stats_apply()",
+]
+POSTGRES_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS item_stats_maintain ON items",
+    "DROP FUNCTION IF EXISTS item_stats_apply()",
+]
+
+
+def _run(sqlite: list[str], postgres: list[str]) -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {"sqlite": sqlite, "postgresql": postgres}.get(dialect, [])
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "item_stats",
+        sa.Column("is_active", sa.Boolean(), autoincrement=False, nullable=False),
+        sa.Column("item_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("price_sum", sa.Float(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("is_active"),
+    )
+    # Triggers first (under a table lock on Postgres), then the backfill, so no
+    # write lands between the two
+    _run(SQLITE_UPGRADE, POSTGRES_UPGRADE)
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    _run(SQLITE_DOWNGRADE, POSTGRES_DOWNGRADE)
+    op.drop_table("item_stats")
@@ -0,0 +1,28 @@
+"""add items version
+
+Revision ID: e4b8d2a6f913
+Revises: c7e2f91a4b30
+Create Date: 2026-10-18 16:30:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e4b8d2a6f913"
+down_revision: str | None = "c7e2f91a4b30"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "items",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    # Plain ALTER TABLE (SQLite 3.35+): a batch rebuild would drop the triggers
+    op.drop_column("items", "version")
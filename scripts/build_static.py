@@ -0,0 +1,94 @@
+"""Builds the dashboard for production serving.
+
+Copies ``app/static`` into ``app/static/dist`` with content-hashed asset names,
+rewrites references in the HTML pages, writes ``manifest.json`` (original path
+-> hashed path) and precompressed ``.gz`` (and ``.br`` when the optional
+``brotli`` package is installed) variants next to each text file. The app
+serves ``dist`` automatically once it exists::
+
+    python -m scripts.build_static
+"""
+
+import gzip
+import hashlib
+import json
+import shutil
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: gzip variants only
+    brotli = None
+
+SOURCE_DIR = Path(__file__).resolve().parents[1] / "app" / "static"
+OUTPUT_DIR = SOURCE_DIR / "dist"
+COMPRESSIBLE = {".html", ".css", ".js", ".json", ".svg", ".txt", ".map"}
+# Pages keep their URL (and revalidate); everything else gets a hashed name
+UNHASHED = {".html"}
+
+
+def _hashed_name(path: Path, data: bytes) -> str:
+    digest = hashlib.blake2b(data, digest_size=5).hexdigest()
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def _compress(path: Path) -> list[Path]:
+    data = path.read_bytes()
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data, quality=11)))
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            target = path.with_name(path.name + suffix)
+            target.write_bytes(compressed)
+            written.append(target)
+    return written
+
+
+def build(source: Path = SOURCE_DIR, output: Path = OUTPUT_DIR) -> dict[str, str]:
+    shutil.rmtree(output, ignore_errors=True)
+    output.mkdir(parents=True)
+    files = [
+        f for f in sorted(source.rglob("*")) if f.is_file() and output not in f.parents
+    ]
+
+    manifest: dict[str, str] = {}
+    for file in files:
+        relative = file.relative_to(source)
+        if file.suffix in UNHASHED:
+            continue
+        data = file.read_bytes()
+        hashed = relative.with_name(_hashed_name(relative, data))
+        (output / hashed).parent.mkdir(parents=True, exist_ok=True)
+        (output / hashed).write_bytes(data)
+        manifest[relative.as_posix()] = hashed.as_posix()
+
+    for file in files:
+        if file.suffix not in UNHASHED:
+            continue
+        html = file.read_text()
+        for original, hashed in manifest.items():
+            html = html.replace(f'"/{original}"', f'"/{hashed}"')
+        target = output / file.relative_to(source)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(html)
+
+    (output / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    for file in list(output.rglob("*")):
+        if file.is_file() and file.suffix in COMPRESSIBLE:
+            _compress(file)
+    return manifest
+
+
+def main() -> None:
+    manifest = build()
+    for original, hashed in manifest.items():
+        print(f"{original} -> {hashed}")
+    if brotli is None:
+        print("brotli not installed: wrote .gz variants only", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
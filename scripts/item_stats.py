@@ -0,0 +1,43 @@
+"""Maintenance for the item_stats summary table.
+
+    python -m scripts.item_stats check     # compare with a full recount
+    python -m scripts.item_stats rebuild   # recompute from items
+
+``check`` exits with status 1 when the summary has drifted.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.db.session import async_session_factory, engine
+from app.repositories.item import ItemRepository
+
+
+async def run(command: str) -> int:
+    try:
+        async with async_session_factory() as session:
+            repository = ItemRepository(session)
+            if command == "rebuild":
+                await repository.rebuild_stats()
+                await session.commit()
+                print("item_stats rebuilt")
+                return 0
+            problems = await repository.check_stats()
+    finally:
+        await engine.dispose()
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if not problems:
+        print("item_stats is consistent")
+    return 1 if problems else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m scripts.item_stats")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    sys.exit(asyncio.run(run(parser.parse_args().command)))
+
+
+if __name__ == "__main__":
+    main()
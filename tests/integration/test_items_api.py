@@ -1,5 +1,30 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
 from httpx import AsyncClient
 
+from app.api.v1.dependencies import (
+    get_item_cache,
+    get_item_coalescer,
+    get_item_feed,
+    get_item_reads,
+    item_admission,
+)
+from app.config import settings
+from app.core.admission import Limiter
+from app.core.metrics import READ_COALESCING
+from app.core.singleflight import SingleFlight
+from app.db import session
+from app.db.session import get_session, instrument_engine
+from app.main import app
+from app.repositories.coalescing import WriteCoalescer
+from app.repositories.item import ItemRepository
+from tests import conftest
+from tests.conftest import test_engine
+
 BASE_URL = "/api/v1/items"
 
 
@@ -115,3 +140,601 @@ async def test_delete_item(client: AsyncClient):
 async def test_delete_item_not_found(client: AsyncClient):
     response = await client.delete(f"{BASE_URL}/999")
     assert response.status_code == 404
+
+
+async def test_list_items_cursor_pagination(client: AsyncClient):
+    for i in range(5):
+        await client.post(f"{BASE_URL}/", json={"name": f"Item {i}", "price": 1.0})
+    first = (await client.get(f"{BASE_URL}/", params={"limit": 2})).json()
+    assert first["next_cursor"] is not None
+    second = (
+        await client.get(
+            f"{BASE_URL}/", params={"limit": 2, "cursor": first["next_cursor"]}
+        )
+    ).json()
+    assert [i["name"] for i in second["items"]] == ["Item 2", "Item 3"]
+    last = (
+        await client.get(
+            f"{BASE_URL}/", params={"limit": 2, "cursor": second["next_cursor"]}
+        )
+    ).json()
+    assert [i["name"] for i in last["items"]] == ["Item 4"]
+    assert last["next_cursor"] is None
+
+
+# One bulk insert lands every row in the same CURRENT_TIMESTAMP second, so
+# paging can only advance through the id tiebreaker
+@pytest.mark.parametrize("sort", ["created_at", "-created_at"])
+async def test_list_items_cursor_same_second(client: AsyncClient, sort: str):
+    response = await client.post(
+        f"{BASE_URL}/bulk",
+        json=[{"name": f"Item {i}", "price": 1.0} for i in range(5)],
+    )
+    ids = [i["id"] for i in response.json()["items"]]
+    seen, cursor = [], None
+    for _ in range(len(ids)):
+        params = {"sort": sort, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = (await client.get(f"{BASE_URL}/", params=params)).json()
+        seen += [i["id"] for i in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert cursor is None
+    assert seen == (ids if sort == "created_at" else ids[::-1])
+
+
+async def test_list_items_invalid_cursor(client: AsyncClient):
+    response = await client.get(f"{BASE_URL}/", params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+
+async def test_list_items_without_total(client: AsyncClient):
+    await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    response = await client.get(f"{BASE_URL}/", params={"include_total": False})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["total"] is None
+
+
+async def test_bulk_create_items(client: AsyncClient):
+    response = await client.post(
+        f"{BASE_URL}/bulk",
+        json=[
+            {"name": "A", "price": 1.0},
+            {"name": "Bad", "price": -1.0},
+            {"name": "C", "price": 3.0},
+        ],
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [i["name"] for i in data["items"]] == ["A", "C"]
+    assert [e["index"] for e in data["errors"]] == [1]
+
+
+async def test_bulk_create_items_over_limit(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_BATCH_SIZE", 2)
+    records = [{"name": f"Item {i}", "price": 1.0} for i in range(3)]
+    response = await client.post(f"{BASE_URL}/bulk", json=records)
+    assert response.status_code == 400
+
+
+async def test_bulk_update_items(client: AsyncClient):
+    created = await client.post(
+        f"{BASE_URL}/bulk",
+        json=[{"name": "A", "price": 1.0}, {"name": "B", "price": 2.0}],
+    )
+    a, b = (i["id"] for i in created.json()["items"])
+    response = await client.put(
+        f"{BASE_URL}/bulk",
+        json=[
+            {"id": a, "name": "A2"},
+            {"id": 999, "name": "Ghost"},
+            {"id": b, "price": 0},
+            {"id": a, "name": "Again"},
+        ],
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [i["name"] for i in data["items"]] == ["A2"]
+    assert [(e["index"], e["id"]) for e in data["errors"]] == [
+        (1, 999),
+        (2, None),
+        (3, a),
+    ]
+
+
+async def test_bulk_delete_items(client: AsyncClient):
+    created = await client.post(
+        f"{BASE_URL}/bulk",
+        json=[{"name": "A", "price": 1.0}, {"name": "B", "price": 2.0}],
+    )
+    ids = [i["id"] for i in created.json()["items"]]
+    response = await client.request(
+        "DELETE", f"{BASE_URL}/bulk", json={"ids": [*ids, 999]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["deleted"] == ids
+    assert [e["id"] for e in data["errors"]] == [999]
+
+
+async def test_get_item_cached(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "ENTITY_CACHE_ENABLED", True)
+    cache = get_item_cache()
+    cache.clear()
+    create_resp = await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    item_id = create_resp.json()["id"]
+    await client.get(f"{BASE_URL}/{item_id}")
+    await client.put(f"{BASE_URL}/{item_id}", json={"name": "B"})
+    response = await client.get(f"{BASE_URL}/{item_id}")
+    assert response.json()["name"] == "B"
+    await client.get(f"{BASE_URL}/{item_id}")
+    assert cache.hits == 1
+    metrics = (await client.get("/metrics")).text
+    assert 'entity_cache{cache="items",stat="hits"} 1' in metrics
+    assert 'entity_cache{cache="items",stat="misses"} 2' in metrics
+    cache.clear()
+
+
+async def test_export_items_ndjson(client: AsyncClient):
+    await client.post(
+        f"{BASE_URL}/bulk",
+        json=[{"name": "A", "price": 1.0}, {"name": "B", "price": 2.0}],
+    )
+    response = await client.get(f"{BASE_URL}/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["name"] for r in rows] == ["A", "B"]
+
+
+async def test_export_items_csv(client: AsyncClient):
+    await client.post(f"{BASE_URL}/", json={"name": "A, with comma", "price": 1.0})
+    response = await client.get(f"{BASE_URL}/export", params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows[0]["name"] == "A, with comma"
+    assert rows[0]["price"] == "1.0"
+
+
+async def test_import_items_ndjson(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    body = "\n".join(
+        [
+            json.dumps({"name": "A", "price": 1.0}),
+            json.dumps({"name": "B", "price": -1.0}),
+            json.dumps({"name": "C", "price": 3.0}),
+            "{broken",
+            json.dumps({"name": "D", "price": 4.0}),
+        ]
+    )
+    response = await client.post(f"{BASE_URL}/import", content=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 3
+    assert data["rejected"] == 2
+    assert [e["line"] for e in data["errors"]] == [2, 4]
+    listing = (await client.get(f"{BASE_URL}/")).json()
+    assert [i["name"] for i in listing["items"]] == ["A", "C", "D"]
+
+
+async def test_import_items_csv(client: AsyncClient):
+    body = "name,price,is_active\nA,1.5,false\nB,2.5,\n"
+    response = await client.post(
+        f"{BASE_URL}/import", params={"format": "csv"}, content=body
+    )
+    assert response.json() == {"inserted": 2, "rejected": 0, "errors": []}
+    listing = (await client.get(f"{BASE_URL}/")).json()
+    assert [i["is_active"] for i in listing["items"]] == [False, True]
+
+
+async def test_list_items_filtered_and_sorted(client: AsyncClient):
+    await client.post(
+        f"{BASE_URL}/bulk",
+        json=[
+            {"name": "Cheap", "price": 1.0},
+            {"name": "Mid", "price": 5.0},
+            {"name": "Pricey", "price": 9.0},
+            {"name": "Off", "price": 6.0, "is_active": False},
+        ],
+    )
+    response = await client.get(
+        f"{BASE_URL}/",
+        params={"is_active": True, "min_price": 2, "sort": "-price", "limit": 1},
+    )
+    data = response.json()
+    assert [i["name"] for i in data["items"]] == ["Pricey"]
+    assert data["total"] == 2
+    next_page = await client.get(
+        f"{BASE_URL}/",
+        params={
+            "is_active": True,
+            "min_price": 2,
+            "sort": "-price",
+            "limit": 1,
+            "cursor": data["next_cursor"],
+        },
+    )
+    assert [i["name"] for i in next_page.json()["items"]] == ["Mid"]
+    # A cursor is only valid for the sort order that produced it
+    mismatch = await client.get(
+        f"{BASE_URL}/", params={"sort": "name", "cursor": data["next_cursor"]}
+    )
+    assert mismatch.status_code == 400
+
+
+async def test_list_items_invalid_sort(client: AsyncClient):
+    response = await client.get(f"{BASE_URL}/", params={"sort": "description"})
+    assert response.status_code == 422
+
+
+async def test_search_items(client: AsyncClient):
+    await client.post(
+        f"{BASE_URL}/bulk",
+        json=[
+            {"name": "Red apple", "price": 1.0},
+            {"name": "Green apple", "price": 1.0},
+            {"name": "Pear", "price": 1.0, "description": "Not an apple"},
+            {"name": "Plum", "price": 1.0},
+        ],
+    )
+    first = await client.get(f"{BASE_URL}/search", params={"q": "apple", "limit": 2})
+    data = first.json()
+    assert len(data["items"]) == 2
+    rest = await client.get(
+        f"{BASE_URL}/search",
+        params={"q": "apple", "limit": 2, "cursor": data["next_cursor"]},
+    )
+    names = {i["name"] for i in data["items"] + rest.json()["items"]}
+    assert names == {"Red apple", "Green apple", "Pear"}
+
+
+async def test_search_items_requires_query(client: AsyncClient):
+    response = await client.get(f"{BASE_URL}/search")
+    assert response.status_code == 422
+
+
+async def test_get_item_conditional(client: AsyncClient):
+    created = await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    url = f"{BASE_URL}/{created.json()['id']}"
+    response = await client.get(url)
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    cached = await client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    since = await client.get(url, headers={"If-Modified-Since": last_modified})
+    assert since.status_code == 304
+
+    stale = await client.get(url, headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.json()["name"] == "A"
+
+
+async def test_get_item_conditional_not_found(client: AsyncClient):
+    response = await client.get(f"{BASE_URL}/99999", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+async def test_list_items_conditional(client: AsyncClient):
+    await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    response = await client.get(f"{BASE_URL}/", params={"limit": 10})
+    etag = response.headers["etag"]
+
+    cached = await client.get(
+        f"{BASE_URL}/", params={"limit": 10}, headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+
+    other_query = await client.get(
+        f"{BASE_URL}/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert other_query.status_code == 200
+
+    await client.post(f"{BASE_URL}/", json={"name": "B", "price": 2.0})
+    changed = await client.get(
+        f"{BASE_URL}/", params={"limit": 10}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+async def test_update_item_if_match(client: AsyncClient):
+    created = await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    url = f"{BASE_URL}/{created.json()['id']}"
+    etag = (await client.get(url)).headers["etag"]
+
+    mismatch = await client.put(
+        url, json={"name": "B"}, headers={"If-Match": '"stale"'}
+    )
+    assert mismatch.status_code == 412
+    assert (await client.get(url)).json()["name"] == "A"
+
+    response = await client.put(url, json={"name": "B"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "B"
+    assert "etag" in response.headers
+
+
+# Both writes land within the same second, so updated_at alone cannot tell
+# the versions apart
+async def test_earlier_etag_is_stale_after_update(client: AsyncClient):
+    created = await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    url = f"{BASE_URL}/{created.json()['id']}"
+    first = (await client.get(url)).headers["etag"]
+
+    updated = await client.put(url, json={"name": "B"}, headers={"If-Match": first})
+    assert updated.status_code == 200
+    assert updated.headers["etag"] != first
+
+    lost_update = await client.put(url, json={"name": "C"}, headers={"If-Match": first})
+    assert lost_update.status_code == 412
+    assert (await client.delete(url, headers={"If-Match": first})).status_code == 412
+    changed = await client.get(url, headers={"If-None-Match": first})
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "B"
+    assert "version" not in changed.json()
+
+
+async def test_delete_item_if_match(client: AsyncClient):
+    created = await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    url = f"{BASE_URL}/{created.json()['id']}"
+    etag = (await client.get(url)).headers["etag"]
+
+    mismatch = await client.delete(url, headers={"If-Match": '"stale"'})
+    assert mismatch.status_code == 412
+
+    response = await client.delete(url, headers={"If-Match": etag})
+    assert response.status_code == 204
+
+
+async def test_list_items_sparse_fields(client: AsyncClient):
+    await client.post(
+        f"{BASE_URL}/", json={"name": "A", "price": 1.0, "description": "long"}
+    )
+    await client.post(f"{BASE_URL}/", json={"name": "B", "price": 2.0})
+    response = await client.get(
+        f"{BASE_URL}/", params={"fields": "name,price", "limit": 1, "sort": "-price"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == [{"name": "B", "price": 2.0}]
+    assert "etag" in response.headers
+    next_page = await client.get(
+        f"{BASE_URL}/",
+        params={"fields": "name", "sort": "-price", "cursor": data["next_cursor"]},
+    )
+    assert next_page.json()["items"] == [{"name": "A"}]
+
+
+async def test_get_item_sparse_fields(client: AsyncClient):
+    created = await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    url = f"{BASE_URL}/{created.json()['id']}"
+    response = await client.get(url, params={"fields": "id, name"})
+    assert response.status_code == 200
+    assert response.json() == {"id": created.json()["id"], "name": "A"}
+    assert response.headers["etag"] != (await client.get(url)).headers["etag"]
+
+
+async def test_sparse_fields_unknown(client: AsyncClient):
+    response = await client.get(f"{BASE_URL}/", params={"fields": "name,secret"})
+    assert response.status_code == 400
+    response = await client.get(f"{BASE_URL}/1", params={"fields": ","})
+    assert response.status_code == 400
+
+
+async def test_server_timing_and_metrics(client: AsyncClient):
+    instrument_engine(test_engine)
+    await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    response = await client.get(f"{BASE_URL}/")
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert '"2 queries"' in timing  # page + total
+
+    metrics = await client.get("/metrics")
+    assert metrics.status_code == 200
+    body = metrics.text
+    assert 'http_request_db_queries_count{route="list_items"}' in body
+    assert 'repository="items",method="get_all_rows"' in body
+    assert "# TYPE db_pool_connections gauge" in body
+
+
+async def test_health_probes(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(session, "engine", test_engine)
+    monkeypatch.setattr(session, "_pools_warmed", False)
+    assert (await client.get("/health/live")).json() == {"status": "ok"}
+    for _ in range(2):
+        response = await client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready"}
+    assert session._pools_warmed is True
+
+
+async def test_create_item_with_write_coalescing(client: AsyncClient):
+    coalescer = WriteCoalescer(
+        conftest.test_session_factory, ItemRepository, "items", window=0.01
+    )
+    app.dependency_overrides[get_item_coalescer] = lambda: coalescer
+    responses = await asyncio.gather(
+        *(
+            client.post(f"{BASE_URL}/", json={"name": f"C{i}", "price": 1.0})
+            for i in range(5)
+        )
+    )
+    assert [r.status_code for r in responses] == [201] * 5
+    assert len({r.json()["id"] for r in responses}) == 5
+    listed = await client.get(f"{BASE_URL}/")
+    assert listed.json()["total"] == 5
+
+
+async def test_list_items_with_read_coalescing(client: AsyncClient):
+    await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    READ_COALESCING.clear()
+    app.dependency_overrides[get_item_reads] = lambda: SingleFlight("items")
+    responses = await asyncio.gather(
+        *(client.get(f"{BASE_URL}/", params={"limit": 10}) for _ in range(5))
+    )
+    assert {r.status_code for r in responses} == {200}
+    assert all(r.json() == responses[0].json() for r in responses)
+    shared = READ_COALESCING.value(("items", "list_rows", "coalesced"))
+    ran = READ_COALESCING.value(("items", "list_rows", "executed"))
+    assert shared + ran == 5
+    metrics = (await client.get("/metrics")).text
+    assert 'read_coalescing_total{service="items",method="list_rows"' in metrics
+
+
+async def test_get_items_by_ids(client: AsyncClient):
+    ids = [
+        (await client.post(f"{BASE_URL}/", json={"name": n, "price": 1.0})).json()["id"]
+        for n in ("A", "B", "C")
+    ]
+    response = await client.get(
+        BASE_URL, params={"ids": f"{ids[2]},{ids[0]},999,{ids[2]}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["name"] for item in data["items"]] == ["C", "A"]
+    assert data["total"] == 2 and data["next_cursor"] is None
+
+    sparse = await client.get(
+        f"{BASE_URL}/", params={"ids": str(ids[1]), "fields": "name"}
+    )
+    assert sparse.json()["items"] == [{"name": "B"}]
+    cached = await client.get(
+        f"{BASE_URL}/",
+        params={"ids": str(ids[1]), "fields": "name"},
+        headers={"If-None-Match": sparse.headers["etag"]},
+    )
+    assert cached.status_code == 304
+
+    for bad in ("1,x", ","):
+        response = await client.get(f"{BASE_URL}/", params={"ids": bad})
+        assert response.status_code == 400
+
+
+async def test_item_change_feed(client: AsyncClient):
+    feed = get_item_feed()
+    last_event_id = feed.event_id(feed.seq)
+    created = (
+        await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    ).json()
+    await client.delete(f"{BASE_URL}/{created['id']}")
+
+    # Streaming response driven directly over ASGI, disconnecting once the
+    # replayed events have arrived
+    sent: list[dict] = []
+    disconnected = asyncio.Event()
+
+    async def receive() -> dict:
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+        if b"event: deleted" in message.get("body", b""):
+            disconnected.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"{BASE_URL}/changes",
+        "raw_path": f"{BASE_URL}/changes".encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"last-event-id", last_event_id.encode())],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    start = sent[0]
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    assert f'"id":{created["id"]}'.encode() in body
+    assert body.index(b"event: created") < body.index(b"event: deleted")
+
+
+async def test_admission_sheds_reads_with_retry_after(client: AsyncClient, monkeypatch):
+    read = item_admission.limiter("list_items", "GET")
+    monkeypatch.setattr(item_admission, "enabled", True)
+    monkeypatch.setattr(read, "limit", 0)
+    monkeypatch.setattr(read, "_max_queue", 0)
+    shed = await client.get(f"{BASE_URL}/")
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == str(item_admission.retry_after)
+    created = await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    assert created.status_code == 201
+    metrics = (await client.get("/metrics")).text
+    assert 'admission_rejected_total{budget="read",reason="queue_full"}' in metrics
+    assert 'admission_requests{budget="write",state="in_flight"} 0' in metrics
+
+
+async def test_item_stats(client: AsyncClient):
+    for name, price, is_active in [
+        ("A", 2.0, True),
+        ("B", 4.0, True),
+        ("C", 9.0, False),
+    ]:
+        payload = {"name": name, "price": price, "is_active": is_active}
+        await client.post(f"{BASE_URL}/", json=payload)
+    response = await client.get(f"{BASE_URL}/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3
+    assert data["total_price"] == 15.0
+    assert data["min_price"] == 2.0
+    assert data["max_price"] == 9.0
+    assert data["active"] == {
+        "count": 2,
+        "total_price": 6.0,
+        "avg_price": 3.0,
+        "min_price": 2.0,
+        "max_price": 4.0,
+    }
+    assert data["inactive"]["count"] == 1
+
+
+async def test_admission_slot_covers_response_and_commit(
+    client: AsyncClient, monkeypatch
+):
+    export = Limiter("export_items", limit=1, max_queue=0, timeout=1)
+    monkeypatch.setattr(item_admission, "enabled", True)
+    monkeypatch.setitem(item_admission._limiters, "export_items", export)
+    write = item_admission.limiter("create_item", "POST")
+    in_flight: list[tuple[int, int]] = []
+
+    # get_session commits in teardown, after the response has been sent
+    async def session_watching_slots():
+        async with conftest.test_session_factory() as db:
+            yield db
+            in_flight.append((write.in_flight, export.in_flight))
+            await db.commit()
+
+    app.dependency_overrides[get_session] = session_watching_slots
+    await client.post(f"{BASE_URL}/", json={"name": "A", "price": 1.0})
+    exported = await client.get(f"{BASE_URL}/export")
+    assert exported.status_code == 200
+    assert in_flight == [(1, 0), (0, 1)]
+    assert (write.in_flight, export.in_flight) == (0, 0)
+
+
+async def test_list_items_name_prefix_max_code_point(client: AsyncClient):
+    response = await client.get(f"{BASE_URL}/?name_prefix=%F4%8F%BF%BF")
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+async def test_list_items_name_prefix_before_surrogates(client: AsyncClient):
+    await client.post(f"{BASE_URL}/", json={"name": "a\ud7ffz", "price": 1.0})
+    response = await client.get(f"{BASE_URL}/?name_prefix=a%ED%9F%BF")
+    assert response.status_code == 200
+    assert [i["name"] for i in response.json()["items"]] == ["a\ud7ffz"]
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionRejectedError, Limiter
+from app.core.exceptions import ServiceUnavailableException
+from app.core.metrics import ADMISSION_REJECTED
+
+
+async def test_limiter_hands_slots_to_waiters_in_order():
+    limiter = Limiter("read", limit=1, max_queue=2, timeout=1)
+    await limiter.acquire()
+    order: list[int] = []
+
+    async def wait(n: int) -> None:
+        await limiter.acquire()
+        order.append(n)
+
+    waiters = [asyncio.create_task(wait(n)) for n in (1, 2)]
+    await asyncio.sleep(0)
+    assert (limiter.in_flight, limiter.queued) == (1, 2)
+    limiter.release()
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*waiters)
+    assert order == [1, 2]
+    assert (limiter.in_flight, limiter.queued) == (1, 0)
+
+
+async def test_limiter_sheds_when_queue_is_full():
+    limiter = Limiter("write", limit=1, max_queue=0, timeout=1)
+    await limiter.acquire()
+    with pytest.raises(AdmissionRejectedError) as rejected:
+        await limiter.acquire()
+    assert rejected.value.reason == "queue_full"
+
+
+async def test_limiter_deadline_leaves_queue_clean():
+    limiter = Limiter("read", limit=1, max_queue=5, timeout=0.01)
+    await limiter.acquire()
+    with pytest.raises(AdmissionRejectedError) as rejected:
+        await limiter.acquire()
+    assert rejected.value.reason == "timeout"
+    cancelled = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+async def test_controller_budgets_and_rejections():
+    ADMISSION_REJECTED.clear()
+    controller = AdmissionController(
+        read_limit=1,
+        write_limit=1,
+        max_queue=0,
+        timeout=1,
+        retry_after=7,
+        route_limits={"export_items": 1},
+    )
+    assert controller.limiter("list_items", "GET").name == "read"
+    assert controller.limiter("create_item", "POST").name == "write"
+    assert controller.limiter("export_items", "GET").name == "export_items"
+    async with controller.admit("list_items", "GET"):
+        async with controller.admit("export_items", "GET"):
+            with pytest.raises(ServiceUnavailableException) as shed:
+                async with controller.admit("get_item", "GET"):
+                    pass
+    assert shed.value.headers == {"Retry-After": "7"}
+    assert ADMISSION_REJECTED.value(("read", "queue_full")) == 1
+    assert dict(controller.usage())[("read", "in_flight")] == 0
@@ -1,8 +1,12 @@
+import asyncio
+
 import pytest
+from sqlalchemy import event, inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import BadRequestException
 from app.models.item import Item
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, _count_cache
 
 
 @pytest.fixture
@@ -71,3 +75,233 @@ async def test_delete(repository: BaseRepository[Item], db_session: AsyncSession
 
 async def test_delete_not_found(repository: BaseRepository[Item]):
     assert await repository.delete(999) is False
+
+
+async def test_writes_bump_version(repository: BaseRepository[Item]):
+    created = await repository.create({"name": "A", "price": 1.0})
+    assert created.version == 1
+    assert (await repository.update(created.id, {"name": "B"})).version == 2
+    [updated] = await repository.update_many({created.id: {"price": 2.0}})
+    assert updated.version == 3
+    version, _ = await repository.get_version(created.id, primary=True)
+    assert version == 3
+
+
+async def test_conditional_writes(repository: BaseRepository[Item]):
+    created = await repository.create({"name": "A", "price": 1.0})
+    assert (
+        await repository.update(created.id, {"name": "B"}, expected_version=2) is None
+    )
+    assert await repository.update(created.id, {}, expected_version=2) is None
+    updated = await repository.update(created.id, {"name": "B"}, expected_version=1)
+    assert updated.name == "B"
+    assert await repository.delete(created.id, expected_version=1) is False
+    assert await repository.delete(created.id, expected_version=2) is True
+
+
+async def test_get_all_after_cursor(
+    repository: BaseRepository[Item], db_session: AsyncSession
+):
+    for i in range(5):
+        await repository.create({"name": f"Item {i}", "price": float(i + 1)})
+    first = await repository.get_all(limit=2)
+    after = repository.cursor_values(first[-1])
+    second = await repository.get_all(limit=2, after=after)
+    assert [i.name for i in second] == ["Item 2", "Item 3"]
+
+
+async def test_get_all_after_invalid_cursor(repository: BaseRepository[Item]):
+    with pytest.raises(BadRequestException):
+        await repository.get_all(after=[1, 2, 3])
+
+
+async def test_total_exact(repository: BaseRepository[Item]):
+    await repository.create({"name": "A", "price": 1.0})
+    assert await repository.total() == 1
+
+
+async def test_total_none_strategy(db_session: AsyncSession):
+    repository = BaseRepository(db_session, Item, count_strategy="none")
+    await repository.create({"name": "A", "price": 1.0})
+    assert await repository.total() is None
+
+
+async def test_total_cached_strategy(db_session: AsyncSession):
+    _count_cache.clear()
+    repository = BaseRepository(db_session, Item, count_strategy="cached")
+    await repository.create({"name": "A", "price": 1.0})
+    assert await repository.total() == 1
+    # Writes through the repository adjust the cached value without a recount
+    created = await repository.create({"name": "B", "price": 1.0})
+    assert await repository.total() == 2
+    await repository.delete(created.id)
+    assert await repository.total() == 1
+    _count_cache.clear()
+
+
+async def test_create_many(repository: BaseRepository[Item]):
+    items = await repository.create_many(
+        [{"name": f"Item {i}", "price": float(i + 1)} for i in range(3)]
+    )
+    assert [i.name for i in items] == ["Item 0", "Item 1", "Item 2"]
+    assert all(i.id is not None for i in items)
+    assert await repository.count() == 3
+
+
+async def test_create_many_keeps_parameter_order(repository: BaseRepository[Item]):
+    # Ids not ascending in parameter order: results must still line up
+    items = await repository.create_many(
+        [
+            {"id": 5, "name": "Five", "price": 5.0},
+            {"id": 2, "name": "Two", "price": 2.0},
+        ]
+    )
+    assert [(i.id, i.name) for i in items] == [(5, "Five"), (2, "Two")]
+
+
+async def test_update_many(repository: BaseRepository[Item]):
+    a = await repository.create({"name": "A", "price": 1.0})
+    b = await repository.create({"name": "B", "price": 2.0})
+    updated = await repository.update_many(
+        {a.id: {"name": "A2"}, b.id: {"price": 5.0}, 999: {"name": "X"}}
+    )
+    assert [(i.name, i.price) for i in updated] == [("A2", 1.0), ("B", 5.0)]
+
+
+async def test_delete_many(repository: BaseRepository[Item]):
+    a = await repository.create({"name": "A", "price": 1.0})
+    b = await repository.create({"name": "B", "price": 2.0})
+    assert await repository.delete_many([a.id, b.id, 999]) == [a.id, b.id]
+    assert await repository.count() == 0
+
+
+@pytest.fixture
+def statements(db_session: AsyncSession):
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+async def test_writes_are_single_statements(
+    repository: BaseRepository[Item], statements: list[str]
+):
+    created = await repository.create({"name": "A", "price": 1.0})
+    await repository.update(created.id, {"name": "B"})
+    await repository.delete(created.id)
+    writes = [s for s in statements if not s.startswith(("BEGIN", "SAVEPOINT"))]
+    assert len(writes) == 3
+    assert all("RETURNING" in s for s in writes)
+
+
+@pytest.fixture
+def fallback_repository(db_session: AsyncSession, monkeypatch) -> BaseRepository:
+    # Simulates a dialect without RETURNING support
+    repository = BaseRepository(db_session, Item)
+    monkeypatch.setattr(repository, "_supports", lambda capability: False)
+    return repository
+
+
+async def test_fallback_writes(fallback_repository: BaseRepository[Item]):
+    created = await fallback_repository.create({"name": "A", "price": 1.0})
+    assert created.id is not None
+    updated = await fallback_repository.update(created.id, {"name": "B"})
+    assert updated.name == "B"
+    assert await fallback_repository.update(999, {"name": "X"}) is None
+    assert updated.version == 2
+    assert await fallback_repository.update(created.id, {"name": "C"}, 1) is None
+    assert await fallback_repository.delete(created.id, 1) is False
+    assert await fallback_repository.delete(created.id) is True
+    assert await fallback_repository.delete(created.id) is False
+
+
+async def test_fallback_bulk_writes(fallback_repository: BaseRepository[Item]):
+    items = await fallback_repository.create_many(
+        [{"name": "A", "price": 1.0}, {"name": "B", "price": 2.0}]
+    )
+    assert [i.name for i in items] == ["A", "B"]
+    ids = [i.id for i in items]
+    assert await fallback_repository.delete_many([*ids, 999]) == ids
+
+
+async def test_stream(repository: BaseRepository[Item]):
+    await repository.create_many(
+        [{"name": f"Item {i}", "price": 1.0} for i in range(5)]
+    )
+    chunks = [chunk async for chunk in repository.stream(chunk_size=2)]
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert [i.name for c in chunks for i in c][-1] == "Item 4"
+
+
+async def test_get_all_fields_projects_columns(
+    repository: BaseRepository[Item], statements: list[str]
+):
+    await repository.create_many(
+        [{"name": f"Item {i}", "price": 1.0, "description": "x"} for i in range(3)]
+    )
+    statements.clear()
+    rows = await repository.get_all_fields(["name", "price"], limit=2, sort="-id")
+    assert rows[0].keys() == {"name", "price", "id"}
+    select_sql = statements[-1].split("FROM")[0]
+    assert "description" not in select_sql
+    cursor = repository.cursor_values(rows[-1], "-id")
+    rest = await repository.get_all_fields(["name"], after=cursor, sort="-id")
+    assert [row["name"] for row in rest] == ["Item 0"]
+
+
+async def test_get_fields(repository: BaseRepository[Item]):
+    created = await repository.create({"name": "A", "price": 1.0})
+    assert await repository.get_fields(created.id, ["name"]) == {"name": "A"}
+    assert await repository.get_fields(999, ["name"]) is None
+    with pytest.raises(BadRequestException):
+        await repository.get_fields(created.id, ["secret"])
+
+
+async def test_get_many(repository: BaseRepository[Item]):
+    a, b = await repository.create_many(
+        [{"name": "A", "price": 1.0}, {"name": "B", "price": 2.0}]
+    )
+    found = await repository.get_many([b.id, 999, a.id, b.id])
+    assert [item.name for item in found] == ["A", "B"]
+    assert await repository.get_many([]) == []
+
+
+async def test_concurrent_get_by_id_is_one_query(
+    repository: BaseRepository[Item], db_session: AsyncSession, statements: list[str]
+):
+    created = await repository.create_many(
+        [{"name": f"Item {i}", "price": 1.0} for i in range(3)]
+    )
+    db_session.expunge_all()
+    statements.clear()
+    ids = [created[0].id, created[2].id, created[0].id, 999]
+    found = await asyncio.gather(*(repository.get_by_id(i) for i in ids))
+    assert [item.name if item else None for item in found] == [
+        "Item 0",
+        "Item 2",
+        "Item 0",
+        None,
+    ]
+    assert found[0] is found[2]
+    assert len(statements) == 1 and " IN " in statements[0]
+
+
+async def test_get_all_rows_skips_identity_map(
+    repository: BaseRepository[Item], db_session: AsyncSession
+):
+    await repository.create_many(
+        [{"name": f"Item {i}", "price": float(i)} for i in range(3)]
+    )
+    db_session.expunge_all()
+    rows = await repository.get_all_rows(limit=2, sort="-id")
+    assert [row["name"] for row in rows] == ["Item 2", "Item 1"]
+    assert rows[0].keys() == set(inspect(Item).column_attrs.keys())
+    assert len(db_session.identity_map) == 0
+    cursor = repository.cursor_values(rows[-1], "-id")
+    rest = await repository.get_all_rows(after=cursor, sort="-id")
+    assert [row["price"] for row in rest] == [0.0]
@@ -1,9 +1,13 @@
+import asyncio
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.singleflight import SingleFlight
 from app.repositories.item import ItemRepository
 from app.schemas.item import ItemCreate, ItemUpdate
 from app.services.item import ItemService
+from tests import conftest
 
 
 @pytest.fixture
@@ -57,3 +61,44 @@ async def test_delete(service: ItemService):
 
 async def test_delete_not_found(service: ItemService):
     assert await service.delete(999) is False
+
+
+async def test_identical_concurrent_reads_are_coalesced(
+    service: ItemService, db_session: AsyncSession
+):
+    created = await service.create(ItemCreate(name="A", price=1.0))
+    await db_session.commit()
+    reads = SingleFlight("items")
+    executed: list[str] = []
+
+    def make_service(session: AsyncSession) -> ItemService:
+        repository = ItemRepository(session)
+        for method in ("get_by_id", "get_all_rows"):
+            target = getattr(repository, method)
+
+            async def traced(*args, _method=method, _target=target):
+                executed.append(_method)
+                return await _target(*args)
+
+            setattr(repository, method, traced)
+        return ItemService(repository, reads=reads)
+
+    async with conftest.test_session_factory() as first:
+        async with conftest.test_session_factory() as second:
+            services = [make_service(first), make_service(second)]
+            items = await asyncio.gather(*(s.get(created.id) for s in services))
+            pages = await asyncio.gather(
+                services[0].list_rows(filters=None),
+                services[1].list_rows(filters={}),
+            )
+    assert executed == ["get_by_id", "get_all_rows"]
+    assert [item.name for item in items] == ["A", "A"]
+    assert items[0] is not items[1]
+    assert pages[0] == pages[1]
+
+
+async def test_reads_after_writes_bypass_coalescing(db_session: AsyncSession):
+    service = ItemService(ItemRepository(db_session), reads=SingleFlight("items"))
+    created = await service.create(ItemCreate(name="A", price=1.0))
+    assert service._repository.has_writes
+    assert await service.get(created.id) is created
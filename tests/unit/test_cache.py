@@ -0,0 +1,36 @@
+from app.core.cache import ICacheBackend, LRUCache
+
+
+async def test_get_set():
+    cache = LRUCache()
+    assert await cache.get("a") is None
+    await cache.set("a", 1)
+    assert await cache.get("a") == 1
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+async def test_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    await cache.get("a")
+    await cache.set("c", 3)
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+
+
+async def test_expires_after_ttl():
+    cache = LRUCache(ttl=0)
+    await cache.set("a", 1)
+    assert await cache.get("a") is None
+
+
+async def test_delete():
+    cache = LRUCache()
+    await cache.set("a", 1)
+    await cache.delete("a")
+    assert await cache.get("a") is None
+
+
+def test_implements_backend_protocol():
+    assert isinstance(LRUCache(), ICacheBackend)
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.models.item import Item
+from app.repositories.cached import CachedRepository, snapshot
+from app.repositories.interfaces import IRepository
+from app.repositories.item import ItemRepository
+
+
+@pytest.fixture
+def cache() -> LRUCache:
+    return LRUCache()
+
+
+@pytest.fixture
+def repository(db_session: AsyncSession, cache: LRUCache) -> CachedRepository[Item]:
+    return CachedRepository(ItemRepository(db_session), cache, namespace="items")
+
+
+def test_implements_repository_protocol(repository: CachedRepository[Item]):
+    assert isinstance(repository, IRepository)
+
+
+async def test_get_by_id_read_through(
+    repository: CachedRepository[Item], cache: LRUCache
+):
+    created = await repository.create({"name": "A", "price": 1.0})
+    first = await repository.get_by_id(created.id)
+    second = await repository.get_by_id(created.id)
+    assert first.name == second.name == "A"
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+async def test_update_invalidates(repository: CachedRepository[Item], cache: LRUCache):
+    created = await repository.create({"name": "A", "price": 1.0})
+    await repository.get_by_id(created.id)
+    await repository.update(created.id, {"name": "B"})
+    assert (await repository.get_by_id(created.id)).name == "B"
+    assert cache.misses == 2
+
+
+async def test_update_invalidates_again_after_commit(
+    repository: CachedRepository[Item], cache: LRUCache, db_session: AsyncSession
+):
+    created = await repository.create({"name": "A", "price": 1.0})
+    await db_session.commit()
+    committed = snapshot(await repository.get_by_id(created.id))
+    await repository.update(created.id, {"price": 2.0})
+    # A concurrent read before the commit re-caches the old committed row
+    await cache.set(f"items:{created.id}", committed)
+    await db_session.commit()
+    await asyncio.sleep(0)
+    assert (await repository.get_by_id(created.id)).price == 2.0
+
+
+async def test_rollback_drops_pending_invalidation(
+    repository: CachedRepository[Item], db_session: AsyncSession
+):
+    created = await repository.create({"name": "A", "price": 1.0})
+    await repository.update(created.id, {"price": 2.0})
+    assert len(db_session.info["on_commit"]) == 1
+    await db_session.rollback()
+    assert "on_commit" not in db_session.info
+
+
+async def test_delete_invalidates(repository: CachedRepository[Item]):
+    created = await repository.create({"name": "A", "price": 1.0})
+    await repository.get_by_id(created.id)
+    assert await repository.delete(created.id) is True
+    assert await repository.get_by_id(created.id) is None
+
+
+async def test_bulk_writes_invalidate(repository: CachedRepository[Item]):
+    a, b = await repository.create_many(
+        [{"name": "A", "price": 1.0}, {"name": "B", "price": 2.0}]
+    )
+    await repository.get_by_id(a.id)
+    await repository.get_by_id(b.id)
+    await repository.update_many({a.id: {"name": "A2"}})
+    assert (await repository.get_by_id(a.id)).name == "A2"
+    await repository.delete_many([b.id])
+    assert await repository.get_by_id(b.id) is None
+
+
+async def test_cached_entity_is_detached_copy(repository: CachedRepository[Item]):
+    created = await repository.create({"name": "A", "price": 1.0})
+    await repository.get_by_id(created.id)
+    cached = await repository.get_by_id(created.id)
+    cached.name = "mutated"
+    assert (await repository.get_by_id(created.id)).name == "A"
+
+
+async def test_entity_specific_queries_pass_through(
+    repository: CachedRepository[Item],
+):
+    await repository.create({"name": "Apple", "price": 1.0})
+    hits = await repository.search("apple")
+    assert [item.name for item, _ in hits] == ["Apple"]
+
+
+async def test_get_many_fills_cache(
+    repository: CachedRepository[Item], cache: LRUCache
+):
+    a, b = await repository.create_many(
+        [{"name": "A", "price": 1.0}, {"name": "B", "price": 2.0}]
+    )
+    await repository.get_by_id(a.id)
+    found = await repository.get_many([b.id, a.id, 999])
+    assert [item.name for item in found] == ["A", "B"]
+    assert cache.stats()["size"] == 2
+    assert [item.name for item in await repository.get_many([b.id])] == ["B"]
+    assert cache.hits == 2
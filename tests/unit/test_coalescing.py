@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.metrics import COALESCED_BATCH_SIZE
+from app.models.item import Item
+from app.repositories.coalescing import WriteCoalescer
+from app.repositories.item import ItemRepository
+from tests import conftest
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    COALESCED_BATCH_SIZE.clear()
+    yield
+    COALESCED_BATCH_SIZE.clear()
+
+
+def _coalescer(max_batch: int = 64, window: float = 0.01) -> WriteCoalescer[Item]:
+    return WriteCoalescer(
+        conftest.test_session_factory, ItemRepository, "test", max_batch, window
+    )
+
+
+def _batch_sizes() -> float:
+    return COALESCED_BATCH_SIZE._sums.get(("test",), 0.0)
+
+
+async def _stored() -> int:
+    async with conftest.test_session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(Item))
+
+
+async def test_concurrent_creates_share_one_commit():
+    coalescer = _coalescer()
+    items = await asyncio.gather(
+        *(coalescer.create({"name": f"Item {i}", "price": i}) for i in range(10))
+    )
+    assert [item.name for item in items] == [f"Item {i}" for i in range(10)]
+    assert len({item.id for item in items}) == 10
+    assert COALESCED_BATCH_SIZE._counts[("test",)][-1] == 0
+    assert sum(COALESCED_BATCH_SIZE._counts[("test",)]) == 1
+    assert await _stored() == 10
+
+
+async def test_batches_are_capped():
+    coalescer = _coalescer(max_batch=3, window=10)
+    create = coalescer.create
+    tasks = [asyncio.create_task(create({"name": "A", "price": 1})) for _ in range(7)]
+    await asyncio.sleep(0)
+    await coalescer.drain()
+    assert len(await asyncio.gather(*tasks)) == 7
+    assert sum(COALESCED_BATCH_SIZE._counts[("test",)]) == 3
+    assert _batch_sizes() == 7
+
+
+async def test_failing_row_only_fails_its_caller():
+    coalescer = _coalescer()
+    results = await asyncio.gather(
+        coalescer.create({"name": "Good", "price": 1}),
+        coalescer.create({"name": None, "price": 1}),
+        coalescer.create({"name": "Also good", "price": 2}),
+        return_exceptions=True,
+    )
+    assert results[0].name == "Good"
+    assert isinstance(results[1], IntegrityError)
+    assert results[2].name == "Also good"
+    assert await _stored() == 2
@@ -0,0 +1,70 @@
+from datetime import UTC, datetime
+
+import pytest
+from starlette.requests import Request
+
+from app.core.conditional import (
+    check_if_match,
+    http_date,
+    is_not_modified,
+    make_etag,
+)
+from app.core.exceptions import PreconditionFailedException
+
+MODIFIED = datetime(2024, 1, 2, 3, 4, 5, 678)
+
+
+def _request(**headers: str) -> Request:
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_make_etag_is_stable_and_quoted():
+    etag = make_etag(1, "2024-01-01")
+    assert etag == make_etag(1, "2024-01-01")
+    assert etag != make_etag(2, "2024-01-01")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_http_date_treats_naive_as_utc():
+    assert http_date(MODIFIED) == "Tue, 02 Jan 2024 03:04:05 GMT"
+    assert http_date(MODIFIED.replace(tzinfo=UTC)) == http_date(MODIFIED)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"x"', False),
+    ],
+)
+def test_if_none_match(header: str, expected: bool):
+    assert is_not_modified(_request(if_none_match=header), '"abc"') is expected
+
+
+def test_if_none_match_takes_precedence():
+    request = _request(if_none_match='"x"', if_modified_since=http_date(MODIFIED))
+    assert is_not_modified(request, '"abc"', MODIFIED) is False
+
+
+@pytest.mark.parametrize(
+    "since, expected",
+    [
+        ("Tue, 02 Jan 2024 03:04:05 GMT", True),
+        ("Tue, 02 Jan 2024 03:04:04 GMT", False),
+        ("garbage", False),
+    ],
+)
+def test_if_modified_since(since: str, expected: bool):
+    request = _request(if_modified_since=since)
+    assert is_not_modified(request, '"abc"', MODIFIED) is expected
+
+
+def test_check_if_match():
+    check_if_match(_request(), '"abc"')
+    check_if_match(_request(if_match='"abc"'), '"abc"')
+    with pytest.raises(PreconditionFailedException):
+        check_if_match(_request(if_match='W/"abc"'), '"abc"')
@@ -0,0 +1,79 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import ChangeFeed
+from app.core.streaming import sse_stream
+from app.db.session import change_feeds
+from app.models.item import Item
+from app.repositories.base import BaseRepository
+
+
+def test_frames_carry_resumable_ids():
+    feed = ChangeFeed("items")
+    feed.publish("created", 7)
+    frame = feed.since(0)[0].decode()
+    assert frame.startswith(f"id: {feed.event_id(1)}\nevent: created\n")
+    assert '"id":7' in frame and frame.endswith("\n\n")
+
+
+def test_resume_from_last_event_id():
+    feed = ChangeFeed("items", buffer_size=2)
+    for entity_id in range(3):
+        feed.publish("updated", entity_id)
+    assert feed.resume_from(None) == 3
+    assert feed.resume_from(feed.event_id(2)) == 2
+    assert feed.since(1) is not None and len(feed.since(1)) == 2
+    assert feed.resume_from(feed.event_id(0)) is None
+    assert feed.since(0) is None
+    assert feed.resume_from(f"other-{1}") is None
+    assert feed.resume_from(feed.event_id(9)) is None
+
+
+async def test_publish_wakes_every_subscriber():
+    feed = ChangeFeed("items")
+    waiters = [asyncio.create_task(feed.wait(0)) for _ in range(100)]
+    await asyncio.sleep(0)
+    assert feed.subscribers == 100
+    feed.publish("deleted", 1)
+    await asyncio.gather(*waiters)
+    assert feed.subscribers == 0
+
+
+async def test_sse_stream_resets_replays_and_keeps_alive():
+    feed = ChangeFeed("items")
+    stream = sse_stream(feed, None, heartbeat=0.01)
+    assert b"event: reset" in await anext(stream)
+    assert await anext(stream) == b": keep-alive\n\n"
+    feed.publish("created", 1)
+    feed.publish("created", 2)
+    frames = await anext(stream)
+    assert frames.count(b"event: created") == 2
+    await stream.aclose()
+
+
+async def test_sse_stream_keeps_events_published_during_a_send():
+    feed = ChangeFeed("items")
+    feed.publish("created", 1)
+    stream = sse_stream(feed, 0, heartbeat=1)
+    assert b'"id":1' in await anext(stream)
+    # Published while the first frame is still being sent
+    feed.publish("created", 2)
+    assert b'"id":2' in await asyncio.wait_for(anext(stream), timeout=0.5)
+    await stream.aclose()
+
+
+async def test_changes_are_published_after_commit(db_session: AsyncSession):
+    feed = change_feeds.get("items")
+    repository = BaseRepository(db_session, Item)
+    start = feed.seq
+    await repository.create({"name": "Rolled back", "price": 1.0})
+    await db_session.rollback()
+    assert feed.seq == start
+    item = await repository.create({"name": "A", "price": 1.0})
+    await repository.update(item.id, {"price": 2.0})
+    assert feed.seq == start
+    await db_session.commit()
+    frames = b"".join(feed.since(start))
+    assert frames.count(b"event: created") == 1
+    assert frames.count(b"event: updated") == 1
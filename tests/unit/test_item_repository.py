@@ -0,0 +1,190 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BadRequestException
+from app.repositories.item import ItemRepository
+
+
+@pytest.fixture
+async def repository(db_session: AsyncSession) -> ItemRepository:
+    repository = ItemRepository(db_session)
+    await repository.create_many(
+        [
+            {"name": "Apple", "price": 3.0, "is_active": True},
+            {"name": "Apricot", "price": 1.0, "is_active": False},
+            {"name": "Banana", "price": 2.0, "is_active": True},
+            {"name": "apple pie", "price": 5.0, "is_active": True},
+        ]
+    )
+    return repository
+
+
+async def _names(repository: ItemRepository, **kwargs) -> list[str]:
+    return [i.name for i in await repository.get_all(**kwargs)]
+
+
+async def test_filter_is_active(repository: ItemRepository):
+    names = await _names(repository, filters={"is_active": False})
+    assert names == ["Apricot"]
+
+
+async def test_filter_price_range(repository: ItemRepository):
+    filters = {"min_price": 2.0, "max_price": 3.0}
+    assert await _names(repository, filters=filters) == ["Apple", "Banana"]
+
+
+async def test_filter_name_prefix_is_case_sensitive(repository: ItemRepository):
+    names = await _names(repository, filters={"name_prefix": "Ap"})
+    assert names == ["Apple", "Apricot"]
+
+
+async def test_filter_name_prefix_ending_in_max_code_point(repository: ItemRepository):
+    top = chr(0x10FFFF)
+    await repository.create({"name": f"Ap{top}x", "price": 1.0})
+    await repository.create({"name": top * 2, "price": 1.0})
+    assert await _names(repository, filters={"name_prefix": f"Ap{top}"}) == [
+        f"Ap{top}x"
+    ]
+    assert await _names(repository, filters={"name_prefix": top}) == [top * 2]
+
+
+async def test_filter_name_prefix_before_surrogates(repository: ItemRepository):
+    await repository.create({"name": "a\ud7ffz", "price": 1.0})
+    await repository.create({"name": "a\ue000", "price": 1.0})
+    assert await _names(repository, filters={"name_prefix": "a\ud7ff"}) == ["a\ud7ffz"]
+
+
+async def test_sort(repository: ItemRepository):
+    assert await _names(repository, sort="price") == [
+        "Apricot",
+        "Banana",
+        "Apple",
+        "apple pie",
+    ]
+    assert (await _names(repository, sort="-name"))[0] == "apple pie"
+
+
+async def test_sort_with_cursor_descending(repository: ItemRepository):
+    first = await repository.get_all(limit=2, sort="-price")
+    after = repository.cursor_values(first[-1], "-price")
+    assert await _names(repository, limit=2, after=after, sort="-price") == [
+        "Banana",
+        "Apricot",
+    ]
+
+
+async def test_count_with_filters(repository: ItemRepository):
+    assert await repository.count({"is_active": True}) == 3
+    assert await repository.total({"name_prefix": "B"}) == 1
+
+
+async def test_unknown_filter_and_sort(repository: ItemRepository):
+    with pytest.raises(BadRequestException):
+        await repository.get_all(filters={"description": "x"})
+    with pytest.raises(BadRequestException):
+        await repository.get_all(sort="description")
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "index"),
+    [
+        ({"sort": "price"}, "ix_items_price_id"),
+        ({"sort": "-created_at"}, "ix_items_created_at_id"),
+        ({"filters": {"name_prefix": "Ap"}, "sort": "name"}, "ix_items_name_id"),
+        (
+            {"filters": {"is_active": True, "min_price": 2.0}, "sort": "price"},
+            "ix_items_is_active_price_id",
+        ),
+        ({"after": [2.0, 3], "sort": "price"}, "ix_items_price_id"),
+    ],
+)
+async def test_list_query_uses_index(
+    repository: ItemRepository, db_session: AsyncSession, kwargs: dict, index: str
+):
+    options = {"skip": 0, "limit": 10, "after": None, "filters": None, "sort": "id"}
+    query = repository._list_query(**{**options, **kwargs})
+    sql = query.compile(
+        dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    result = await db_session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    plan = " | ".join(row.detail for row in result)
+    assert index in plan
+    assert "TEMP B-TREE" not in plan
+
+
+async def test_search(repository: ItemRepository):
+    await repository.create(
+        {"name": "Smoothie", "price": 4.0, "description": "banana and apple"}
+    )
+    hits = await repository.search("apple")
+    assert {item.name for item, _ in hits} == {"Apple", "apple pie", "Smoothie"}
+    ranks = [rank for _, rank in hits]
+    assert ranks == sorted(ranks)
+
+
+async def test_search_prefix_and_sync(repository: ItemRepository):
+    assert [i.name for i, _ in await repository.search("Apri")] == ["Apricot"]
+    apricot = (await repository.search("apricot"))[0][0]
+    await repository.update(apricot.id, {"name": "Peach"})
+    assert await repository.search("apricot") == []
+    await repository.delete(apricot.id)
+    assert await repository.search("peach") == []
+
+
+async def test_search_paging(repository: ItemRepository):
+    first = await repository.search("apple", limit=1)
+    item, rank = first[0]
+    rest = await repository.search("apple", after=[rank, item.id])
+    assert item.id not in {i.id for i, _ in rest}
+    assert len(rest) == 1
+
+
+async def test_search_ignores_query_syntax(repository: ItemRepository):
+    assert await repository.search('"') == []
+    assert len(await repository.search('apple" OR "banana')) == 0
+
+
+async def _stats(repository: ItemRepository) -> dict[bool, tuple]:
+    return {
+        row["is_active"]: (
+            row["item_count"],
+            row["price_sum"],
+            row["min_price"],
+            row["max_price"],
+        )
+        for row in await repository.stats()
+    }
+
+
+async def test_stats_follow_writes(repository: ItemRepository):
+    assert await _stats(repository) == {
+        True: (3, 10.0, 2.0, 5.0),
+        False: (1, 1.0, 1.0, 1.0),
+    }
+    apple = (await repository.search("Apple"))[0][0]
+    await repository.update(apple.id, {"price": 4.0})
+    await repository.update(apple.id, {"is_active": False})
+    assert await _stats(repository) == {
+        True: (2, 7.0, 2.0, 5.0),
+        False: (2, 5.0, 1.0, 4.0),
+    }
+    inactive = await repository.get_all(filters={"is_active": False})
+    await repository.delete(inactive[0].id)
+    await repository.delete_many([inactive[1].id])
+    assert await _stats(repository) == {
+        True: (2, 7.0, 2.0, 5.0),
+        False: (0, 0.0, None, None),
+    }
+    assert await repository.check_stats() == []
+
+
+async def test_check_and_rebuild_stats(repository: ItemRepository):
+    await repository._session.execute(
+        text("UPDATE item_stats SET item_count = 7 WHERE is_active")
+    )
+    assert await repository.check_stats() == [
+        "is_active=True: stored count=7 sum=10.0, actual count=3 sum=10.0"
+    ]
+    await repository.rebuild_stats()
+    assert await repository.check_stats() == []
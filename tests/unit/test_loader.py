@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.core.loader import BatchLoader
+
+
+class _Source:
+    def __init__(self) -> None:
+        self.batches: list[list[int]] = []
+
+    async def fetch(self, keys: list[int]) -> dict[int, str]:
+        self.batches.append(keys)
+        await asyncio.sleep(0)
+        return {key: f"v{key}" for key in keys if key > 0}
+
+
+async def test_same_tick_loads_are_batched_and_deduplicated():
+    source = _Source()
+    loader = BatchLoader(source.fetch)
+    results = await asyncio.gather(*(loader.load(k) for k in (1, 2, 1, -1)))
+    assert results == ["v1", "v2", "v1", None]
+    assert source.batches == [[1, 2, -1]]
+    assert await loader.load(1) == "v1"
+    assert source.batches[-1] == [1]
+
+
+async def test_errors_reach_every_caller():
+    async def fail(keys: list[int]) -> dict[int, str]:
+        raise RuntimeError("boom")
+
+    loader = BatchLoader(fail)
+    results = await asyncio.gather(
+        loader.load(1), loader.load(2), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_cancelled_batch_cancels_callers():
+    started = asyncio.Event()
+
+    async def hang(keys: list[int]) -> dict[int, str]:
+        started.set()
+        await asyncio.Event().wait()
+        return {}
+
+    loader = BatchLoader(hang)
+    callers = asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+    await started.wait()
+    for task in loader._batches:
+        task.cancel()
+    results = await asyncio.wait_for(callers, timeout=1)
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+async def test_cancelled_caller_does_not_cancel_shared_key():
+    loader = BatchLoader(_Source().fetch)
+    first = asyncio.create_task(loader.load(1))
+    second = asyncio.create_task(loader.load(1))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "v1"
+    with pytest.raises(asyncio.CancelledError):
+        await first
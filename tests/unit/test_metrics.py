@@ -0,0 +1,62 @@
+from app.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    RequestStats,
+    _request_stats,
+    record_query,
+)
+from app.repositories.instrumented import InstrumentedRepository
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(("/items",), value)
+    lines = list(histogram.render())
+    assert lines[:2] == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+    ]
+    assert 'latency_seconds_bucket{route="/items",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/items",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/items",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/items"} 3' in lines
+
+
+def test_registry_escapes_label_values():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("h", "H.", ("route",), (1.0,)))
+    histogram.observe(('a"b',), 0.5)
+    assert 'h_count{route="a\\"b"} 1' in registry.render()
+
+
+def test_record_query_outside_request_is_ignored():
+    record_query(0.01)
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        record_query(0.01)
+        record_query(0.02)
+    finally:
+        _request_stats.reset(token)
+    assert stats.queries == 2
+    assert stats.server_timing(0.05).startswith('db;dur=30.00;desc="2 queries"')
+
+
+class _Repository:
+    async def get_by_id(self, entity_id: int) -> int:
+        return entity_id
+
+    def cursor_values(self, entity: int) -> list[int]:
+        return [entity]
+
+
+async def test_instrumented_repository_times_coroutines():
+    from app.core.metrics import REPOSITORY_SECONDS
+
+    repository = InstrumentedRepository(_Repository(), "things")
+    assert await repository.get_by_id(7) == 7
+    assert repository.cursor_values(3) == [3]
+    rendered = "\n".join(REPOSITORY_SECONDS.render())
+    assert 'repository="things",method="get_by_id"' in rendered
+    assert "cursor_values" not in rendered
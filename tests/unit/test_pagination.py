@@ -0,0 +1,22 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import BadRequestException
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    values = [datetime(2024, 1, 2, 3, 4, 5), "name", 1.5, 42]
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+def test_cursor_is_opaque():
+    token = encode_cursor([42])
+    assert "42" not in token
+
+
+@pytest.mark.parametrize("token", ["not-base64!", "e30", "W10", "W3t9XQ"])
+def test_decode_invalid_cursor(token: str):
+    with pytest.raises(BadRequestException):
+        decode_cursor(token)
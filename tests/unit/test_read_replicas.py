@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db.base import Base
+from app.db.session import ReplicaRouter
+from app.models.item import Item
+from app.repositories.base import BaseRepository
+
+
+@pytest.fixture
+async def replica_session():
+    # A separate in-memory database standing in for a read replica
+    replica = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with replica.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(replica, expire_on_commit=False) as session:
+        session.add(Item(name="Replica", price=1.0))
+        await session.commit()
+        yield session
+    await replica.dispose()
+
+
+async def test_reads_use_replica(db_session: AsyncSession, replica_session):
+    repository = BaseRepository(db_session, Item, read_session=replica_session)
+    assert (await repository.get_by_id(1)).name == "Replica"
+    assert [i.name for i in await repository.get_all()] == ["Replica"]
+    assert await repository.count() == 1
+
+
+async def test_reads_after_write_use_primary(db_session: AsyncSession, replica_session):
+    repository = BaseRepository(db_session, Item, read_session=replica_session)
+    await repository.create({"name": "Primary", "price": 2.0})
+    assert (await repository.get_by_id(1)).name == "Primary"
+    assert [i.name for i in await repository.get_all()] == ["Primary"]
+
+
+async def test_write_preconditions_read_primary(
+    db_session: AsyncSession, replica_session
+):
+    primary = BaseRepository(db_session, Item)
+    created = await primary.create({"name": "Primary", "price": 2.0})
+    await primary.update(created.id, {"price": 3.0})
+    await db_session.commit()
+    db_session.info.clear()
+    repository = BaseRepository(db_session, Item, read_session=replica_session)
+    # The lagging replica still has version 1 of this row
+    assert (await repository.get_version(created.id))[0] == 1
+    assert (await repository.get_version(created.id, primary=True))[0] == 2
+
+
+def test_round_robin_routing():
+    engines = [create_async_engine("sqlite+aiosqlite:///:memory:") for _ in range(2)]
+    router = ReplicaRouter(engines)
+    assert [router.choose() for _ in range(3)] == [engines[0], engines[1], engines[0]]
+
+
+async def test_least_busy_routing():
+    engines = [create_async_engine("sqlite+aiosqlite:///:memory:") for _ in range(2)]
+    router = ReplicaRouter(engines, strategy="least_busy")
+    async with router.session() as first:
+        assert first.bind is engines[0]
+        async with router.session() as second:
+            assert second.bind is engines[1]
+    await router.dispose()
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.db.schema import (
+    MIGRATIONS_DIR,
+    SchemaMismatchError,
+    check_schema,
+    create_schema,
+    expected_heads,
+)
+from app.db.session import build_engine
+
+
+@pytest.fixture
+async def file_engine(tmp_path: Path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    await engine.dispose()
+
+
+async def _stamp(engine, revision: str) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)")
+        )
+        await conn.execute(
+            text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision}
+        )
+
+
+def test_expected_heads_matches_alembic():
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory(str(MIGRATIONS_DIR))
+    assert expected_heads() == set(script.get_heads())
+
+
+def test_expected_heads_handles_branches(tmp_path: Path):
+    for name, body in {
+        "a": 'revision = "a"\ndown_revision = None',
+        "b": 'revision: str = "b"\ndown_revision: str | None = "a"',
+        "c": "revision = 'c'\ndown_revision = 'a'",
+        "d": 'revision = "d"\ndown_revision = ("b", "c")',
+        "e": 'revision = "e"\ndown_revision = "a"',
+    }.items():
+        (tmp_path / f"{name}.py").write_text(body)
+    assert expected_heads(tmp_path) == {"d", "e"}
+
+
+async def test_check_schema_at_head(file_engine):
+    await _stamp(file_engine, next(iter(expected_heads())))
+    await check_schema(file_engine)
+
+
+async def test_check_schema_behind_head(file_engine):
+    await _stamp(file_engine, "a4dabee28176")
+    with pytest.raises(SchemaMismatchError, match="alembic upgrade head"):
+        await check_schema(file_engine)
+
+
+async def test_check_schema_unmigrated(file_engine):
+    with pytest.raises(SchemaMismatchError, match="none"):
+        await check_schema(file_engine)
+
+
+async def test_create_schema(file_engine):
+    await create_schema(file_engine)
+    async with file_engine.connect() as conn:
+        tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+    assert "items" in tables
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from app.core.serialization import dump_json, json_response, row_dicts, type_adapter
+from app.models.item import Item
+from app.schemas.base import PaginatedResponse
+from app.schemas.item import ItemResponse
+
+NOW = datetime(2024, 1, 1, 12, 30)
+
+
+def _item(item_id: int) -> Item:
+    return Item(
+        id=item_id,
+        name=f"Item {item_id}",
+        description=None,
+        price=1.5,
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def test_type_adapter_is_cached():
+    schema = PaginatedResponse[ItemResponse]
+    assert type_adapter(schema) is type_adapter(schema)
+
+
+def test_dump_json_matches_model_path():
+    items = [_item(1), _item(2)]
+    expected = PaginatedResponse(
+        items=[ItemResponse.model_validate(i) for i in items],
+        total=2,
+        skip=0,
+        limit=10,
+    ).model_dump_json()
+    page = {"items": row_dicts(items), "total": 2, "skip": 0, "limit": 10}
+    assert dump_json(PaginatedResponse[ItemResponse], page) == expected.encode()
+
+
+def test_json_response():
+    response = json_response(ItemResponse, row_dicts([_item(1)])[0], {"ETag": '"x"'})
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == '"x"'
+    assert ItemResponse.model_validate_json(response.body).id == 1
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import POOL_WAIT_SECONDS, RequestStats, _request_stats
+from app.db.session import TimedQueuePool, build_engine, engine_options
+
+
+def test_engine_options_memory_has_no_pool_sizing():
+    options = engine_options("sqlite+aiosqlite:///:memory:")
+    assert "pool_size" not in options
+    assert "query_cache_size" in options
+
+
+def test_engine_options_file_has_pool_sizing():
+    options = engine_options("sqlite+aiosqlite:///./app.db")
+    assert options["pool_size"] > 0
+    assert "max_overflow" in options
+
+
+async def test_sqlite_pragmas_applied(tmp_path: Path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.connect() as conn:
+        journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+    await engine.dispose()
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 5000
+
+
+async def test_engine_records_pool_wait_and_queries(tmp_path: Path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", "bench")
+    POOL_WAIT_SECONDS.clear()
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+    finally:
+        _request_stats.reset(token)
+    await engine.dispose()
+    assert isinstance(engine.sync_engine.pool, TimedQueuePool)
+    assert stats.queries == 2
+    assert stats.db_time > 0
+    assert 'db_pool_checkout_wait_seconds_count{engine="bench"} 1' in "\n".join(
+        POOL_WAIT_SECONDS.render()
+    )
+
+
+async def test_failed_statements_are_recorded_and_cleared(tmp_path: Path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            for _ in range(2):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing"))
+            assert (await conn.get_raw_connection()).info["query_started"] == []
+    finally:
+        _request_stats.reset(token)
+    await engine.dispose()
+    assert stats.queries == 2
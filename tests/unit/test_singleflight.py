@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.core.metrics import READ_COALESCING
+from app.core.singleflight import SingleFlight
+
+
+class _Source:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def fetch(self) -> list[int]:
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        return [call]
+
+
+async def _started(*tasks: asyncio.Task) -> None:
+    for _ in tasks:
+        await asyncio.sleep(0)
+
+
+async def test_identical_calls_share_one_execution():
+    READ_COALESCING.clear()
+    flight, source = SingleFlight("test"), _Source()
+    tasks = [
+        asyncio.create_task(flight.do("list", (0, 50), source.fetch, list))
+        for _ in range(3)
+    ]
+    other = asyncio.create_task(flight.do("list", (50, 50), source.fetch))
+    await _started(*tasks, other)
+    assert flight.in_flight == 2
+    source.release.set()
+    results = await asyncio.gather(*tasks)
+    assert results == [[1], [1], [1]]
+    # Followers get their own copy
+    assert results[0] is not results[1]
+    assert await other == [2]
+    assert source.calls == 2
+    assert flight.in_flight == 0
+    assert READ_COALESCING.value(("test", "list", "executed")) == 2
+    assert READ_COALESCING.value(("test", "list", "coalesced")) == 2
+    # Nothing outlives the flight
+    assert await flight.do("list", (0, 50), source.fetch) == [3]
+
+
+async def test_errors_reach_every_caller():
+    flight, release = SingleFlight("test"), asyncio.Event()
+
+    async def fail() -> None:
+        await release.wait()
+        raise RuntimeError("boom")
+
+    tasks = [asyncio.create_task(flight.do("get", 1, fail)) for _ in range(2)]
+    await _started(*tasks)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.in_flight == 0
+
+
+async def test_cancelled_leader_hands_over_to_a_follower():
+    flight, source = SingleFlight("test"), _Source()
+    leader = asyncio.create_task(flight.do("get", 1, source.fetch))
+    followers = [
+        asyncio.create_task(flight.do("get", 1, source.fetch)) for _ in range(2)
+    ]
+    await _started(leader, *followers)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    await _started(*followers)
+    source.release.set()
+    assert await asyncio.gather(*followers) == [[2], [2]]
+    assert source.calls == 2
+
+
+async def test_cancelled_follower_does_not_cancel_the_flight():
+    flight, source = SingleFlight("test"), _Source()
+    leader = asyncio.create_task(flight.do("get", 1, source.fetch))
+    follower = asyncio.create_task(flight.do("get", 1, source.fetch))
+    await _started(leader, follower)
+    follower.cancel()
+    source.release.set()
+    assert await leader == [1]
+    with pytest.raises(asyncio.CancelledError):
+        await follower
@@ -0,0 +1,70 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.core.static import IMMUTABLE, REVALIDATE, CachedStaticFiles
+from scripts.build_static import build
+
+CSS = "body { color: red; }\n" * 50
+
+
+@pytest.fixture
+def dist(tmp_path: Path) -> Path:
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "style.css").write_text(CSS)
+    (source / "index.html").write_text('<link href="/css/style.css">' * 20)
+    build(source, source / "dist")
+    return source / "dist"
+
+
+@pytest.fixture
+async def static_client(dist: Path):
+    app = Starlette(routes=[Mount("/", CachedStaticFiles(directory=dist, html=True))])
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+def test_build_hashes_assets_and_rewrites_html(dist: Path):
+    manifest = json.loads((dist / "manifest.json").read_text())
+    hashed = manifest["css/style.css"]
+    assert hashed.startswith("css/style.") and hashed != "css/style.css"
+    assert f'"/{hashed}"' in (dist / "index.html").read_text()
+    assert gzip.decompress((dist / f"{hashed}.gz").read_bytes()).decode() == CSS
+
+
+async def test_serves_gzip_variant_with_immutable_caching(
+    static_client: AsyncClient, dist: Path
+):
+    hashed = json.loads((dist / "manifest.json").read_text())["css/style.css"]
+    response = await static_client.get(
+        f"/{hashed}", headers={"Accept-Encoding": "br;q=0, gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == CSS
+
+    identity = await static_client.get(
+        f"/{hashed}", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in identity.headers
+    assert identity.text == CSS
+
+
+async def test_pages_revalidate_with_etag(static_client: AsyncClient):
+    response = await static_client.get("/")
+    assert response.headers["cache-control"] == REVALIDATE
+    cached = await static_client.get(
+        "/", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["cache-control"] == REVALIDATE
@@ -0,0 +1,92 @@
+import csv
+from collections.abc import AsyncIterator
+
+from app.core.streaming import csv_records, iter_lines, ndjson_records
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+async def test_iter_lines_across_chunk_boundaries():
+    # "é" is split between chunks mid code point
+    chunks = _chunks(b"first\nsec", b"ond\r\nthi\xc3", b"\xa9rd")
+    lines = [line async for line in iter_lines(chunks)]
+    assert lines == [(1, "first"), (2, "second"), (3, "thiérd")]
+
+
+async def test_ndjson_records():
+    chunks = _chunks(b'{"name": "A"}\n\nnot json\n[1]\n')
+    records = [r async for r in ndjson_records(chunks)]
+    assert records == [
+        (1, {"name": "A"}, None),
+        (3, None, "Invalid JSON"),
+        (4, None, "Expected a JSON object"),
+    ]
+
+
+async def test_csv_records():
+    chunks = _chunks(b'name,price,description\nA,1.0,\nB,2.0,"multi\nline"\nC\n')
+    records = [r async for r in csv_records(chunks)]
+    assert records == [
+        (2, {"name": "A", "price": "1.0"}, None),
+        (3, {"name": "B", "price": "2.0", "description": "multi\nline"}, None),
+        (5, None, "Expected 3 columns, got 1"),
+    ]
+
+
+async def test_csv_unterminated_quote():
+    records = [r async for r in csv_records(_chunks(b'name\n"open'))]
+    assert records == [(2, None, "Unterminated quoted field")]
+
+
+async def test_csv_stray_quote_inside_field():
+    chunks = _chunks(b'name,price\nTv 5" screen,10\nA,1\nB,2\n')
+    records = [r async for r in csv_records(chunks)]
+    assert records == [
+        (2, {"name": 'Tv 5" screen', "price": "10"}, None),
+        (3, {"name": "A", "price": "1"}, None),
+        (4, {"name": "B", "price": "2"}, None),
+    ]
+
+
+async def test_csv_quoted_field_across_chunks():
+    chunks = _chunks(b'name,description\nA,"one\ntw', b'o\nthree"\nB,x\n')
+    records = [r async for r in csv_records(chunks)]
+    assert records == [
+        (2, {"name": "A", "description": "one\ntwo\nthree"}, None),
+        (5, {"name": "B", "description": "x"}, None),
+    ]
+
+
+async def test_iter_lines_drops_long_lines():
+    chunks = _chunks(b"short\nlong", b"er than", b" ten\nok\ntoo long at end")
+    lines = [line async for line in iter_lines(chunks, max_length=10)]
+    assert lines == [(1, "short"), (2, None), (3, "ok"), (4, None)]
+
+
+async def test_records_over_max_size():
+    chunks = _chunks(b'{"name": "A"}\n{"name": "far too long"}\n')
+    records = [r async for r in ndjson_records(chunks, max_size=15)]
+    assert records == [(1, {"name": "A"}, None), (2, None, "Record too large")]
+
+    # A long unquoted line is skipped; a quoted field that outgrows the limit
+    # stops the parse because the next record can't be found
+    chunks = _chunks(b'name\nA\nfar too long\nB\n"x\nyy\nzz\nC\n')
+    records = [r async for r in csv_records(chunks, max_size=8)]
+    assert records == [
+        (2, {"name": "A"}, None),
+        (3, None, "Record too large"),
+        (4, {"name": "B"}, None),
+        (5, None, "Record too large"),
+    ]
+
+
+async def test_csv_field_over_csv_limit():
+    field = b"x" * (csv.field_size_limit() + 1)
+    records = [r async for r in csv_records(_chunks(b"name\n" + field + b"\nA\n"))]
+    assert records == [
+        (2, None, f"field larger than field limit ({csv.field_size_limit()})"),
+        (3, {"name": "A"}, None),
+    ]